@@ -0,0 +1,78 @@
+"""
+Decode time of the greedy decoder as the exemplars grow in patients and operating rooms. Run it from the root of the
+repository:
+
+    python -m benchmarks.bench_scaling --patients 100 200 400 800 --operating_rooms 5 10 20 --plot scaling.png
+
+The plot needs matplotlib, without it only the table is printed.
+"""
+import argparse
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from benchmarks.bench_solver import measure
+from src.heuristics import HeuristicGenerator
+from src.instance import get_instance
+from src.instance.generator import generate_instance, write_instance
+from src.solution import SOLUTION_PARAMETERS_LIST, Solution
+
+
+def decode_time(path_input: Path, parameters_index: int, repeat: int) -> float:
+    instance = get_instance(path_input)
+    heuristic = HeuristicGenerator().get_heuristics_without_random()[0]
+    solution_parameters = SOLUTION_PARAMETERS_LIST[parameters_index]
+    return measure(lambda: Solution(instance, solution_parameters).find_solution(heuristic), repeat)
+
+
+def plot(path: str, patients: List[int], operating_rooms: List[int], timings: Dict[Tuple[int, int], float]) -> None:
+    try:
+        import matplotlib
+
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("matplotlib is not installed, the plot is skipped")
+        return
+    figure, axes = plt.subplots()
+    for rooms in operating_rooms:
+        axes.plot(patients, [timings[size, rooms] * 1000 for size in patients], marker="o", label=f"{rooms} rooms")
+    axes.set_xlabel("patients")
+    axes.set_ylabel("ms per decode")
+    axes.legend()
+    figure.savefig(path)
+    print(f"Plot saved to {path}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--patients", type=int, nargs="+", default=[50, 100, 200, 400])
+    parser.add_argument("--operating_rooms", type=int, nargs="+", default=[5, 10, 20])
+    parser.add_argument("--surgical_types", type=int, default=6)
+    parser.add_argument("--parameters_index", type=int, default=0, help="SolutionParameters preset to decode with")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--plot", default=None, help="image file for the plot of decode time against patients")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    timings: Dict[Tuple[int, int], float] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        # The cache entries of the synthetic exemplars go away with them
+        os.environ["HOSPITAL_ANOUK_CACHE"] = str(Path(directory) / "cache")
+        for size in args.patients:
+            for rooms in args.operating_rooms:
+                path_input = Path(directory) / f"exemplar_{size}_{rooms}.txt"
+                write_instance(path_input, generate_instance(size, args.surgical_types, rooms, args.seed))
+                timings[size, rooms] = decode_time(path_input, args.parameters_index, args.repeat)
+
+    # Milliseconds per decode, a row per number of patients and a column per number of operating rooms
+    print(f"{'patients':<10}" + "".join(f"{f'{rooms} rooms':>14}" for rooms in args.operating_rooms))
+    for size in args.patients:
+        print(f"{size:<10}" + "".join(f"{timings[size, rooms] * 1000:>14.3f}" for rooms in args.operating_rooms))
+
+    if args.plot is not None:
+        plot(args.plot, args.patients, args.operating_rooms, timings)
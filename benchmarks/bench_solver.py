@@ -0,0 +1,109 @@
+"""
+Timings of the solver stages on synthetic exemplars of increasing size. Run it from the root of the repository:
+
+    python -m benchmarks.bench_solver --save bench.json
+    python -m benchmarks.bench_solver --baseline bench.json
+
+With a baseline, it exits with an error if a stage got slower than the tolerance allows.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+from typing import Callable, Dict
+
+from src.heuristics import EvolutionaryAlgorithm, HeuristicGenerator
+from src.instance import get_instance
+from src.instance.generator import generate_instance, write_instance
+from src.instance.read_file import read_file
+from src.solution import SOLUTION_PARAMETERS_LIST, Result, Solution
+from src.tester import tester
+
+_SIZES_ = [50, 100, 200, 400]
+_POPULATION_SIZE_ = 20
+
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    """Seconds per call, the best of `repeat` runs long enough to be timed"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def bench_exemplar(path_input: Path, path_output: Path, repeat: int) -> Dict[str, float]:
+    timings = {
+        "read_file": measure(lambda: read_file(path_input), repeat),
+        "get_instance": measure(lambda: get_instance(path_input), repeat),
+    }
+    instance = get_instance(path_input)
+    heuristic = HeuristicGenerator().get_heuristics_without_random()[0]
+    for parameters_index, solution_parameters in enumerate(SOLUTION_PARAMETERS_LIST):
+        timings[f"find_solution[{parameters_index}]"] = measure(
+            lambda: Solution(instance, solution_parameters).find_solution(heuristic), repeat
+        )
+
+    patients = [patient.id for patient in instance.patients]
+    rng = random.Random(0)
+    population = [(rng.sample(patients, len(patients)), float(rng.randint(1, 100))) for _ in range(_POPULATION_SIZE_)]
+    timings["get_population"] = measure(
+        lambda: EvolutionaryAlgorithm(population, rng=random.Random(0)).get_population(), repeat
+    )
+
+    solution = Solution(instance, SOLUTION_PARAMETERS_LIST[0])
+    solution.find_solution(heuristic)
+    result = Result()
+    result.add_improvement(solution.value(), 0)
+    result.add_best(solution)
+    with open(path_output, "w") as f:
+        f.write(str(result))
+    timings["tester"] = measure(lambda: tester(path_input, path_output), repeat)
+    return timings
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=_SIZES_, help="number of patients of the exemplars")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save", default=None, help="JSON file to write the timings to")
+    parser.add_argument("--baseline", default=None, help="JSON file with timings to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="slowdown allowed against the baseline")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    timings: Dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        # The cache entries of the synthetic exemplars go away with them
+        os.environ["HOSPITAL_ANOUK_CACHE"] = str(Path(directory) / "cache")
+        for size in args.sizes:
+            path_input = Path(directory) / f"exemplar_{size}.txt"
+            write_instance(path_input, generate_instance(size, number_operating_rooms=max(1, size // 20), seed=size))
+            for stage, seconds in bench_exemplar(path_input, Path(directory) / f"sol_{size}.txt", args.repeat).items():
+                timings[f"{stage}/{size}"] = seconds
+
+    baseline = {}
+    if args.baseline is not None:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+    slower = []
+    print(f"{'stage/patients':<28}{'ms/call':>12}{'calls/s':>12}{'baseline':>12}")
+    for key, seconds in timings.items():
+        line = f"{key:<28}{seconds * 1000:>12.3f}{1 / seconds:>12.1f}"
+        if key in baseline:
+            ratio = seconds / baseline[key]
+            line += f"{ratio:>11.2f}x"
+            if ratio > 1 + args.tolerance:
+                slower.append(key)
+        print(line)
+
+    if args.save is not None:
+        with open(args.save, "w") as f:
+            json.dump(timings, f, indent=2)
+    if slower:
+        print(f"Slower than the baseline: {', '.join(slower)}")
+        sys.exit(1)
@@ -1,45 +1,66 @@
 import argparse
 import multiprocessing
+import multiprocessing.pool
+import os
 import random
 import time
+from array import array
+from contextlib import nullcontext
 from pathlib import Path
-from typing import List, Tuple
+from typing import Any, Callable, List, Optional, Tuple
 
 from src.elements.patient import Patient
-from src.heuristics import EvolutionaryAlgorithm, HeuristicBase, HeuristicGenerator, PredefinedOrder
+from src.heuristics import CROSSOVER_OPERATORS, EvolutionaryAlgorithm, FitnessCache, HeuristicBase, HeuristicGenerator
 from src.instance import get_instance
-from src.solution import SOLUTION_PARAMETERS_LIST, Result, Solution, SolutionParameters
+from src.instance.instance import Instance
+from src.parallel import (
+    DeadlineScheduler,
+    DecodedOrder,
+    decode_heuristic,
+    decode_order,
+    init_worker,
+    profiled,
+    run_islands,
+)
+from src.profiling import PROFILER
+from src.solution import SOLUTION_PARAMETERS_LIST, Result, Solution
 from src.tester import tester
 
-
-def get_best_order_par(
-    heuristic_path: Tuple[HeuristicBase, Path, SolutionParameters]
-) -> Tuple[List[Patient], Solution]:
-    heuristic, path_input, solution_parameters = heuristic_path
-    instance = get_instance(path_input)
-    solution = Solution(instance, solution_parameters)
-    solution_list = solution.find_solution(heuristic)
-    return solution_list, solution
+# Seconds to find a solution, leaving a margin for the maximum of the tester
+_TIME_BUDGET_ = 60 * 4
 
 
 def run_parallel(
-    heuristics: List[HeuristicBase],
+    pool: multiprocessing.pool.Pool,
+    decode: Callable[[Tuple[Path, Any, int]], DecodedOrder],
+    tasks: List[Tuple[Path, Any, int]],
     result: Result,
-    path_input: Path,
     cpu_time: float,
-    solution_parameters: SolutionParameters,
-) -> List[Tuple[List[Patient], float]]:
-    solutions: List[Tuple[List[Patient], Solution]] = []
-    heuristics_to_process = [(heuristic, path_input, solution_parameters) for heuristic in heuristics]
-    with multiprocessing.Pool() as pool:
-        solutions = pool.map(get_best_order_par, heuristics_to_process)
-
-    returning_value: List[Tuple[List[Patient], float]] = []
-    for list_patients, solution in solutions:
-        returning_value.append((list_patients, solution.value()))
-        if result.best_sol is None or result.best_sol.value() < solution.value():
-            result.add_improvement(solution.value(), int((time.time() - cpu_time)))
-            result.add_best(solution)
+    instance: Instance,
+    fitness_cache: FitnessCache,
+    scheduler: DeadlineScheduler,
+    keep_deadline: bool = True,
+) -> List[Tuple[List[int], float]]:
+    if PROFILER.enabled:
+        # The workers send the measures of every task along with its result
+        decoded_orders: List[DecodedOrder] = []
+        for decoded_order, profile in scheduler.map(pool, profiled, [(decode, task) for task in tasks], keep_deadline):
+            decoded_orders.append(decoded_order)
+            PROFILER.merge(profile)
+    else:
+        decoded_orders = scheduler.map(pool, decode, tasks, keep_deadline)
+
+    returning_value: List[Tuple[List[int], float]] = []
+    for (patients_order, value, compact_solution), (_, _, parameters_index) in zip(decoded_orders, tasks):
+        returning_value.append((patients_order.tolist(), value))
+        fitness_cache.put(patients_order, parameters_index, value)
+        if result.best_sol is None or result.best_sol.value() < value:
+            result.add_improvement(value, int((time.time() - cpu_time)))
+            result.add_best(
+                Solution.from_compact(instance, compact_solution, SOLUTION_PARAMETERS_LIST[parameters_index])
+            )
+    # The best solution of a generation often comes right after the previous one, held back by the interval
+    result.flush_if_due()
     return returning_value
 
 
@@ -56,33 +77,85 @@ def get_best_order(
     return solution_list, solution.value()
 
 
-def find_result(path_input: Path, path_output: Path) -> Tuple[float, float]:
+def find_result(
+    path_input: Path,
+    path_output: Path,
+    crossover: str = "one_point",
+    islands: int = 0,
+    time_budget: float = _TIME_BUDGET_,
+    pool: Optional[multiprocessing.pool.Pool] = None,
+    processes: Optional[int] = None,
+    seed: int = 0,
+) -> Tuple[float, float]:
+    """
+    Solves the exemplar in `path_input` within `time_budget` seconds. A `pool` of processes started with
+    `init_worker` can be shared by several calls, keeping `processes` decodes of this call in flight. The evolution
+    only draws from a generator seeded with `seed`, so calls running in parallel threads do not disturb each other.
+    """
     cpu_time = time.time()
-    result = Result()
-    random.seed(0)
+    # The output file is replaced by every new best solution, so a killed run leaves a valid one
+    result = Result(path_output)
+    rng = random.Random(seed)
+    fitness_cache = FitnessCache()
+    processes = processes or os.cpu_count() or 1
+    scheduler = DeadlineScheduler(time_budget, cpu_time, processes)
 
-    for solution_parameters in SOLUTION_PARAMETERS_LIST:
-        patients_list: List[Tuple[List[Patient], float]] = run_parallel(
-            HeuristicGenerator().get_heuristics_without_random(), result, path_input, cpu_time, solution_parameters
+    instance = get_instance(path_input)
+    # A shared pool is left running for the next exemplars
+    if pool is None:
+        pool_context = multiprocessing.Pool(processes, initializer=init_worker, initargs=(path_input,))
+    else:
+        pool_context = nullcontext(pool)
+    with pool_context as pool:
+        # The greedy heuristics always run, as they give the initial population
+        heuristics = HeuristicGenerator().get_heuristics_without_random()
+        for parameters_index in range(len(SOLUTION_PARAMETERS_LIST)):
+            tasks = [(path_input, heuristic, parameters_index) for heuristic in heuristics]
+            patients_list: List[Tuple[List[int], float]] = run_parallel(
+                pool, decode_heuristic, tasks, result, cpu_time, instance, fitness_cache, scheduler, False
+            )
+
+        best_parameters_index = SOLUTION_PARAMETERS_LIST.index(result.best_sol.solution_parameters)
+        while islands == 0 and scheduler.fits():
+            optimization = EvolutionaryAlgorithm(patients_list, crossover, rng)
+            # Only the children that were never decoded are sent to the pool
+            children = [
+                (child, fitness_cache.get(child, best_parameters_index)) for child in optimization.get_population()
+            ]
+            tasks = [
+                (path_input, array("H", child), best_parameters_index) for child, value in children if value is None
+            ]
+            decoded = run_parallel(pool, decode_order, tasks, result, cpu_time, instance, fitness_cache, scheduler)
+            if len(decoded) < len(tasks):
+                # The deadline cut the generation short
+                break
+            # The children keep their order, the decoded ones taking the place they had
+            decoded_values = iter(decoded)
+            patients_list = [(child, value) if value is not None else next(decoded_values) for child, value in children]
+            patients_list.append((optimization.get_best_exemplar()))
+
+    if islands > 0:
+        run_islands(
+            islands,
+            path_input,
+            patients_list,
+            best_parameters_index,
+            crossover,
+            scheduler.deadline,
+            result,
+            cpu_time,
+            instance,
+            fitness_cache,
         )
 
-    while time.time() - cpu_time < 60 * 4:
-        optimization = EvolutionaryAlgorithm(patients_list)
-        algorithms_list = [PredefinedOrder(child) for child in optimization.get_population()]
-        patients_list = run_parallel(algorithms_list, result, path_input, cpu_time, result.best_sol.solution_parameters)
-        patients_list.append((optimization.get_best_exemplar()))
-
-    visualize_or(result.best_sol.assignments_by_or)
-    visualize_ur(result.best_sol.assignments_by_ur)
-
     assert result.best_sol is not None
-    with open(path_output, "w+") as f:
-        f.write(str(result))
+    result.close()
 
     is_correct, message = tester(path_input, path_output)
     if not is_correct:
         print(path_input)
         print(message)
+    print(f"Fitness cache: {fitness_cache}")
 
     return result.best_sol.value(), int(time.time() - cpu_time)
 
@@ -91,6 +164,18 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--exemplar", required=True)
     parser.add_argument("--solution", required=True)
+    parser.add_argument("--crossover", default="one_point", choices=sorted(CROSSOVER_OPERATORS))
+    parser.add_argument(
+        "--islands",
+        type=int,
+        default=0,
+        help="number of processes evolving their own population (island model), 0 to evolve a single one",
+    )
+    parser.add_argument("--time_budget", type=float, default=_TIME_BUDGET_, help="seconds to find a solution")
+    parser.add_argument("--profile", action="store_true", help="print the time spent in each stage of the solver")
 
     args = parser.parse_args()
-    print(find_result(args.exemplar, args.solution))
+    PROFILER.enabled = args.profile
+    print(find_result(args.exemplar, args.solution, args.crossover, args.islands, args.time_budget))
+    if PROFILER.enabled:
+        print(PROFILER.report())
@@ -1,7 +1,20 @@
 import argparse
+import csv
+import json
+import multiprocessing
+import multiprocessing.pool
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
 
-from main import find_result
+from main import _TIME_BUDGET_, find_result
+from src.parallel import init_worker
+from src.profiling import PROFILER
+from src.tester import tester
+
+_SUMMARY_FIELDS_ = ["ejemplar", "Solution cost 1", "Acceptable cost", "Bigger?", "Seconds", "Error"]
 
 
 def convert_file_to_dict(path):
@@ -18,34 +31,159 @@ def parse_args():
     parser.add_argument("--input_path", default="data/Exemplars/data")
     parser.add_argument("--save_path", default="data/Exemplars/solutions")
     parser.add_argument("--minimum_quality", default="data/calidad_minima_all_ejemplares.txt")
+    parser.add_argument("--time_budget", type=float, default=_TIME_BUDGET_, help="seconds to solve each exemplar")
+    parser.add_argument(
+        "--concurrency", type=int, default=1, help="exemplars solved at the same time, sharing the worker pool"
+    )
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="size of the worker pool")
+    parser.add_argument("--summary", default=None, help="CSV file, or JSONL if it ends in .jsonl, with the results")
+    parser.add_argument(
+        "--journal", default=None, help="JSONL file each finished exemplar is appended to, journal.jsonl in save_path"
+    )
+    parser.add_argument(
+        "--resume", action="store_true", help="skip the exemplars in the journal whose solution passes the tester"
+    )
+    parser.add_argument(
+        "--profile", action="store_true", help="print the time spent in each stage of the solver over all exemplars"
+    )
     arguments = parser.parse_args()
     return arguments
 
 
+class Journal:
+    """Results of the finished exemplars, appended one line at a time so that a sweep can be resumed"""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._drop_partial_line()
+
+    def _drop_partial_line(self) -> None:
+        """Removes the line a crash could have cut short, so that new lines do not get appended to it"""
+        if not os.path.isfile(self.path):
+            return
+        with open(self.path, "rb+") as f:
+            content = f.read()
+            if content and not content.endswith(b"\n"):
+                f.truncate(content.rfind(b"\n") + 1)
+
+    def read(self) -> Dict[str, Dict[str, Any]]:
+        rows: Dict[str, Dict[str, Any]] = {}
+        if not os.path.isfile(self.path):
+            return rows
+        with open(self.path, "r") as f:
+            for line in f:
+                row = json.loads(line)
+                rows[row["ejemplar"]] = row
+        return rows
+
+    def append(self, row: Dict[str, Any]) -> None:
+        with self._lock, open(self.path, "a") as f:
+            f.write(json.dumps(row) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def is_solved(exemplar_txt: os.DirEntry, save_path: str, row: Optional[Dict[str, Any]]) -> bool:
+    path_output = os.path.join(save_path, "sol_" + exemplar_txt.name)
+    if row is None or row["Error"] or not os.path.isfile(path_output):
+        return False
+    try:
+        return tester(exemplar_txt.path, path_output)[0]
+    except Exception:
+        return False
+
+
+def solve_exemplar(
+    exemplar_txt: os.DirEntry,
+    save_path: str,
+    minimum_quality: Dict[str, str],
+    time_budget: float,
+    pool: multiprocessing.pool.Pool,
+    processes: int,
+    journal: Journal,
+) -> Dict[str, Any]:
+    row: Dict[str, Any] = dict.fromkeys(_SUMMARY_FIELDS_, "")
+    row["ejemplar"] = exemplar_txt.name
+    try:
+        solution_cost, seconds = find_result(
+            exemplar_txt.path,
+            os.path.join(save_path, "sol_" + exemplar_txt.name),
+            time_budget=time_budget,
+            pool=pool,
+            processes=processes,
+        )
+        row.update({"Solution cost 1": solution_cost, "Seconds": seconds})
+        row["Acceptable cost"] = float(minimum_quality[exemplar_txt.name])
+        row["Bigger?"] = solution_cost >= row["Acceptable cost"]
+        print(
+            f"{exemplar_txt.name} --> "
+            f"solution_cost: {solution_cost} "
+            f"acceptable cost: {minimum_quality[exemplar_txt.name]}"
+        )
+    except Exception as e:
+        row["Error"] = str(e)
+        print(f"{exemplar_txt.name}: {e}")
+    journal.append(row)
+    return row
+
+
+def write_summary(path: str, rows: List[Dict[str, Any]]) -> None:
+    with open(path, "w", newline="") as f:
+        if Path(path).suffix == ".jsonl":
+            for row in rows:
+                f.write(json.dumps(row) + "\n")
+        else:
+            writer = csv.DictWriter(f, fieldnames=_SUMMARY_FIELDS_)
+            writer.writeheader()
+            writer.writerows(rows)
+
+
 if __name__ == "__main__":
     args = parse_args()
-    correct = 0
-    passes_quality = 0
+    PROFILER.enabled = args.profile
     minimum_quality_file = convert_file_to_dict(args.minimum_quality)
-    for exemplar_txt in os.scandir(args.input_path):
-        # if not os.path.isfile(exemplar_txt):
-        #     continue
-        if exemplar_txt.name == "ejemplar_p.txt":
-            continue
-        save_path = os.path.join(args.save_path, "sol_" + exemplar_txt.name)
-        try:
-            solution_cost = find_result(exemplar_txt.path, save_path)[0]
-            if solution_cost >= float(minimum_quality_file[exemplar_txt.name]):
-                passes_quality += 1
-
-            print(
-                f"{exemplar_txt.name} --> "
-                f"solution_cost: {solution_cost} "
-                f"acceptable cost: {minimum_quality_file[exemplar_txt.name]}"
+    # Only the exemplars of the folder are solved, other files are skipped
+    exemplars = sorted(
+        (
+            exemplar_txt
+            for exemplar_txt in os.scandir(args.input_path)
+            if exemplar_txt.name.endswith(".txt") and exemplar_txt.name != "ejemplar_p.txt"
+        ),
+        key=lambda exemplar_txt: exemplar_txt.name,
+    )
+    os.makedirs(args.save_path, exist_ok=True)
+    journal = Journal(args.journal or os.path.join(args.save_path, "journal.jsonl"))
+    solved: Dict[str, Dict[str, Any]] = {}
+    if args.resume:
+        journal_rows = journal.read()
+        for exemplar_txt in exemplars:
+            if is_solved(exemplar_txt, args.save_path, journal_rows.get(exemplar_txt.name)):
+                solved[exemplar_txt.name] = journal_rows[exemplar_txt.name]
+                print(f"{exemplar_txt.name}: already solved")
+    # The exemplars being solved share the pool, each keeping its share of the processes busy
+    processes_per_exemplar = max(1, args.processes // args.concurrency)
+    with multiprocessing.Pool(args.processes, initializer=init_worker) as pool:
+        with ThreadPoolExecutor(args.concurrency) as executor:
+            new_rows = list(
+                executor.map(
+                    lambda exemplar_txt: solve_exemplar(
+                        exemplar_txt,
+                        args.save_path,
+                        minimum_quality_file,
+                        args.time_budget,
+                        pool,
+                        processes_per_exemplar,
+                        journal,
+                    ),
+                    [exemplar_txt for exemplar_txt in exemplars if exemplar_txt.name not in solved],
+                )
             )
-            correct += 1
-        except Exception as e:
-            print(f"{exemplar_txt.name}: {e}")
+    rows = sorted(list(solved.values()) + new_rows, key=lambda row: row["ejemplar"])
 
-    print(f"Correct answers: {correct}")
-    print(f"Number of accepted solutions: {passes_quality}")
+    if args.summary is not None:
+        write_summary(args.summary, rows)
+    print(f"Correct answers: {sum(1 for row in rows if not row['Error'])}")
+    print(f"Number of accepted solutions: {sum(1 for row in rows if row['Bigger?'] is True)}")
+    if PROFILER.enabled:
+        print(PROFILER.report())
@@ -3,14 +3,17 @@ class Id:
     Id class for elements. Its inherence makes classes comparables and addible to hashed collections
     """
 
+    __slots__ = ("id",)
+
     def __init__(self, id: int):
         self.id: int = id
 
     def __hash__(self):
-        return hash(self.id)
+        # Equal to hash(self.id) for the non-negative ids of the instances
+        return self.id
 
     def __eq__(self, other):
-        return self.id == other.id
+        return self is other or self.id == other.id
 
     def __ne__(self, other):
         return self.id != other.id
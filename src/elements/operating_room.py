@@ -3,6 +3,8 @@ from .surgical_type import SurgicalType
 
 
 class OperatingRoom(Id):
+    __slots__ = ("surgical_type",)
+
     def __init__(self, id_or: int, surgical_type: SurgicalType):
         super().__init__(id_or)
         self.surgical_type: SurgicalType = surgical_type
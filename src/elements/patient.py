@@ -3,17 +3,23 @@ from .surgical_type import SurgicalType
 
 
 class Patient(Id):
+    __slots__ = ("priority", "sex", "surgical_type", "operation_cleaning_time", "_time_to_uce", "_time_to_leave")
+
     def __init__(self, id_patient: int, priority: int, sex: int, surgical_type: SurgicalType):
         super().__init__(id_patient)
         self.priority: int = priority
         self.sex: int = sex
         self.surgical_type: SurgicalType = surgical_type
+        # Durations used by the heuristics and the decoder, computed once as the surgical type does not change
+        self.operation_cleaning_time: int = surgical_type.operation_time + surgical_type.cleaning_time
+        self._time_to_uce: int = surgical_type.urpa_time + surgical_type.operation_time
+        self._time_to_leave: int = self._time_to_uce + surgical_type.uce_time
 
     def __repr__(self) -> str:
         return f"<id={self.id}, priority={self.priority}, sex={self.sex}, surgical_type={self.surgical_type.id}>"
 
     def time_to_uce(self) -> int:
-        return self.surgical_type.urpa_time + self.surgical_type.operation_time
+        return self._time_to_uce
 
     def time_to_leave(self) -> int:
-        return self.time_to_uce() + self.surgical_type.uce_time
+        return self._time_to_leave
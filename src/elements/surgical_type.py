@@ -5,6 +5,8 @@ _URPA_MAX_WAITING_TIME_ = 12
 
 
 class SurgicalType(Id):
+    __slots__ = ("operation_time", "cleaning_time", "urpa_time", "urpa_max_waiting_time", "uce_time")
+
     def __init__(self, id_st: int, operation_time: int, urpa_time: int, uce_time: int):
         super().__init__(id_st)
         self.operation_time: int = operation_time
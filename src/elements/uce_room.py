@@ -4,6 +4,8 @@ _CAPACITY_ = 2
 
 
 class UceRoom(Id):
+    __slots__ = ("capacity", "_sex")
+
     def __init__(self, id_uce: int):
         super().__init__(id_uce)
         self.capacity: int = _CAPACITY_
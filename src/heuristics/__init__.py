@@ -1,2 +1,4 @@
+from .crossover import CROSSOVER_OPERATORS
+from .fitness_cache import FitnessCache
 from .heuristics_list import HeuristicBase, HeuristicGenerator, PredefinedOrder
 from .optimizer import EvolutionaryAlgorithm
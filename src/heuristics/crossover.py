@@ -0,0 +1,120 @@
+"""
+Crossover operators for orders of patients given as permutations of their ids. All of them run in linear time,
+using arrays indexed by id to check membership and positions. Their random choices come from the generator they get.
+"""
+import random
+from typing import Callable, Dict, List, Sequence, Set
+
+Order = Sequence[int]
+CrossoverOperator = Callable[[Order, Order, random.Random], List[int]]
+
+
+def _cut_points(size: int, rng: random.Random) -> List[int]:
+    return sorted(rng.sample(range(size + 1), 2)) if size > 0 else [0, 0]
+
+
+def one_point_crossover(parent_1: Order, parent_2: Order, rng: random.Random) -> List[int]:
+    """Keeps a prefix of the first parent and completes it in the order of the second one"""
+    crossover_point = rng.randint(0, len(parent_1))
+    in_prefix = bytearray(max(parent_1, default=0) + 1)
+    for patient in parent_1[:crossover_point]:
+        in_prefix[patient] = 1
+    return list(parent_1[:crossover_point]) + [patient for patient in parent_2 if not in_prefix[patient]]
+
+
+def order_crossover(parent_1: Order, parent_2: Order, rng: random.Random) -> List[int]:
+    """OX: keeps a segment of the first parent and fills the rest, after the segment, in the order of the second"""
+    size = len(parent_1)
+    start, end = _cut_points(size, rng)
+    child = list(parent_1)
+    in_segment = bytearray(max(parent_1, default=0) + 1)
+    for patient in parent_1[start:end]:
+        in_segment[patient] = 1
+    position = end
+    for idx in range(size):
+        patient = parent_2[(end + idx) % size]
+        if not in_segment[patient]:
+            child[position % size] = patient
+            position += 1
+    return child
+
+
+def partially_mapped_crossover(parent_1: Order, parent_2: Order, rng: random.Random) -> List[int]:
+    """PMX: keeps a segment of the first parent and the positions of the second one, mapping the conflicts"""
+    start, end = _cut_points(len(parent_1), rng)
+    position_1 = [0] * (max(parent_1, default=0) + 1)
+    for idx, patient in enumerate(parent_1):
+        position_1[patient] = idx
+    child = list(parent_2)
+    child[start:end] = parent_1[start:end]
+    for idx in list(range(start)) + list(range(end, len(parent_1))):
+        patient = parent_2[idx]
+        while start <= position_1[patient] < end:
+            patient = parent_2[position_1[patient]]
+        child[idx] = patient
+    return child
+
+
+def cycle_crossover(parent_1: Order, parent_2: Order, rng: random.Random) -> List[int]:
+    """CX: every patient keeps the position it has in one of the parents, alternating parents on each cycle"""
+    position_1 = [0] * (max(parent_1, default=0) + 1)
+    for idx, patient in enumerate(parent_1):
+        position_1[patient] = idx
+    child = list(parent_1)
+    visited = bytearray(len(parent_1))
+    from_second = False
+    for start in range(len(parent_1)):
+        if visited[start]:
+            continue
+        idx = start
+        while not visited[idx]:
+            visited[idx] = 1
+            if from_second:
+                child[idx] = parent_2[idx]
+            idx = position_1[parent_2[idx]]
+        from_second = not from_second
+    return child
+
+
+def edge_recombination_crossover(parent_1: Order, parent_2: Order, rng: random.Random) -> List[int]:
+    """ERX: builds the child following the neighbours the patients have in any of the parents"""
+    size = len(parent_1)
+    if size == 0:
+        return []
+    neighbours: Dict[int, Set[int]] = {patient: set() for patient in parent_1}
+    for parent in (parent_1, parent_2):
+        for idx, patient in enumerate(parent):
+            neighbours[patient].update((parent[idx - 1], parent[(idx + 1) % size]))
+    for patient, patient_neighbours in neighbours.items():
+        patient_neighbours.discard(patient)
+    # Unvisited patients, removed in constant time by moving the last one to their place
+    remaining = list(parent_1)
+    position = {patient: idx for idx, patient in enumerate(remaining)}
+
+    child: List[int] = []
+    patient = parent_1[0]
+    while True:
+        child.append(patient)
+        last = remaining.pop()
+        if last != patient:
+            remaining[position[patient]] = last
+            position[last] = position[patient]
+        candidates = neighbours.pop(patient)
+        for neighbour in candidates:
+            neighbours[neighbour].discard(patient)
+        if not remaining:
+            return child
+        if not candidates:
+            patient = rng.choice(remaining)
+            continue
+        fewest = min(len(neighbours[neighbour]) for neighbour in candidates)
+        patient = rng.choice(sorted(neighbour for neighbour in candidates if len(neighbours[neighbour]) == fewest))
+
+
+CROSSOVER_OPERATORS: Dict[str, CrossoverOperator] = {
+    "one_point": one_point_crossover,
+    "order": order_crossover,
+    "partially_mapped": partially_mapped_crossover,
+    "cycle": cycle_crossover,
+    "edge_recombination": edge_recombination_crossover,
+}
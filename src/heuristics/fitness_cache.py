@@ -0,0 +1,46 @@
+from array import array
+from collections import OrderedDict
+from hashlib import blake2b
+from typing import Optional, Sequence, Tuple
+
+
+class FitnessCache:
+    """
+    Least recently used cache of the values of decoded orders. Orders are stored by a hash of their patient ids, so
+    every entry takes the same memory whatever the number of patients
+    """
+
+    def __init__(self, max_size: int = 100_000) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._values: "OrderedDict[Tuple[int, bytes], float]" = OrderedDict()
+
+    @staticmethod
+    def _key(order: Sequence[int], parameters_index: int) -> Tuple[int, bytes]:
+        return parameters_index, blake2b(array("H", order).tobytes(), digest_size=16).digest()
+
+    def get(self, order: Sequence[int], parameters_index: int) -> Optional[float]:
+        key = self._key(order, parameters_index)
+        value = self._values.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._values.move_to_end(key)
+        return value
+
+    def put(self, order: Sequence[int], parameters_index: int, value: float) -> None:
+        key = self._key(order, parameters_index)
+        self._values[key] = value
+        self._values.move_to_end(key)
+        if len(self._values) > self.max_size:
+            self._values.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __str__(self) -> str:
+        lookups = self.hits + self.misses
+        hit_rate = 100 * self.hits / lookups if lookups > 0 else 0
+        return f"hits={self.hits}, misses={self.misses}, hit rate={hit_rate:.1f}%, size={len(self)}"
@@ -1,19 +1,27 @@
 import random
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
-from ..elements.patient import Patient
+from .crossover import CROSSOVER_OPERATORS
 
 
 class EvolutionaryAlgorithm:
-    def __init__(self, population: List[Tuple[List[Patient], float]]) -> None:
+    def __init__(
+        self,
+        population: List[Tuple[List[int], float]],
+        crossover_operator: str = "one_point",
+        rng: Optional[random.Random] = None,
+    ) -> None:
         self.patients_orders, self.fitness = [list(x) for x in zip(*population)]
         self.elite_index = max(range(len(self.fitness)), key=self.fitness.__getitem__)
         self.crossover_rate = 0.9
         self.mutation_rate = 0.1
         self.tournament_size = 3
+        self.crossover_operator = CROSSOVER_OPERATORS[crossover_operator]
+        # Each run draws from its own generator, so that runs in parallel threads can be reproduced
+        self.rng = rng if rng is not None else random.Random()
 
-    def get_population(self) -> List[List[Patient]]:
-        population: List[List[Patient]] = []
+    def get_population(self) -> List[List[int]]:
+        population: List[List[int]] = []
         for _ in range(1, len(self.patients_orders)):
             parent_1 = self.roulette_selection()
             parent_2 = self.tournament_selection()
@@ -21,27 +29,24 @@ class EvolutionaryAlgorithm:
             population.append(self.mutate(child))
         return population
 
-    def roulette_selection(self) -> List[Patient]:
-        idx = random.choices(population=list(range(len(self.patients_orders))), weights=self.fitness, k=1)[0]
+    def roulette_selection(self) -> List[int]:
+        idx = self.rng.choices(population=list(range(len(self.patients_orders))), weights=self.fitness, k=1)[0]
         return self.patients_orders[idx]
 
-    def tournament_selection(self) -> List[Patient]:
-        tournament_contestants = random.sample(range(len(self.patients_orders)), self.tournament_size)
+    def tournament_selection(self) -> List[int]:
+        tournament_contestants = self.rng.sample(range(len(self.patients_orders)), self.tournament_size)
         winner = max(tournament_contestants, key=lambda x: self.fitness[x])
         return self.patients_orders[winner]
 
-    def crossover(self, parent_1: List[Patient], parent_2: List[Patient]) -> List[Patient]:
-        crossover_point = random.randint(0, len(parent_1))
-        remaining_patients = [patient for patient in parent_2 if patient not in parent_1[:crossover_point]]
-        child = parent_1[:crossover_point] + remaining_patients
-        return child
+    def crossover(self, parent_1: List[int], parent_2: List[int]) -> List[int]:
+        return self.crossover_operator(parent_1, parent_2, self.rng)
 
-    def mutate(self, child: List[Patient]) -> List[Patient]:
-        if random.random() > self.mutation_rate:
+    def mutate(self, child: List[int]) -> List[int]:
+        if self.rng.random() > self.mutation_rate:
             return child
-        idx_1, idx_2 = random.sample(range(len(child)), 2)
+        idx_1, idx_2 = self.rng.sample(range(len(child)), 2)
         child[idx_1], child[idx_2] = child[idx_2], child[idx_1]
         return child
 
-    def get_best_exemplar(self) -> Tuple[List[Patient], float]:
+    def get_best_exemplar(self) -> Tuple[List[int], float]:
         return (self.patients_orders[self.elite_index], self.fitness[self.elite_index])
@@ -1 +1 @@
-from .read_file import read_file as get_instance
+from .binary_cache import read_cached as get_instance
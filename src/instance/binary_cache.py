@@ -0,0 +1,121 @@
+"""
+Binary cache of the exemplar files, so that their text is only parsed once. The cache of an exemplar keeps its vectors
+packed as integers, together with the size, inode, modification and change times of the file they come from: a cache
+entry that does not match the current file is ignored and written again. The change time cannot be set by user tools,
+so a file rewritten with the same size and modification time is still detected.
+
+The entries live in a cache directory, keyed by the path of the exemplar, and only the most recently written ones are
+kept. The environment variable HOSPITAL_ANOUK_CACHE sets the directory, or turns the cache off if it is empty, "0" or
+"off".
+"""
+import hashlib
+import os
+import struct
+from pathlib import Path
+from typing import Optional, Tuple
+
+from .instance import Instance
+from .read_file import InstanceData, build_instance, parse_text
+
+_CACHE_VARIABLE_ = "HOSPITAL_ANOUK_CACHE"
+_SUFFIX_ = ".bin"
+_MAX_ENTRIES_ = 256
+_MAGIC_ = b"HAI3"
+# Magic, size, inode, modification and change times of the exemplar file and length of each vector
+_HEADER_ = struct.Struct(f"<4sQQqq{len(InstanceData._fields)}I")
+
+
+def cache_dir() -> Optional[Path]:
+    """Directory of the cache, None if it is turned off"""
+    setting = os.environ.get(_CACHE_VARIABLE_)
+    if setting is None:
+        return Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "hospital_anouk"
+    if setting.lower() in ("", "0", "off"):
+        return None
+    return Path(setting)
+
+
+def cache_path(path: Path, directory: Path) -> Path:
+    key = hashlib.blake2b(str(Path(path).resolve()).encode(), digest_size=16).hexdigest()
+    return directory / (key + _SUFFIX_)
+
+
+def _file_key(stat: os.stat_result) -> Tuple[int, int, int, int]:
+    return stat.st_size, stat.st_ino, stat.st_mtime_ns, stat.st_ctime_ns
+
+
+def _pack(data: InstanceData, stat: os.stat_result) -> bytes:
+    values = [value for vector in data for value in vector]
+    header = _HEADER_.pack(_MAGIC_, *_file_key(stat), *map(len, data))
+    return header + struct.pack(f"<{len(values)}i", *values)
+
+
+def _unpack(content: bytes, stat: os.stat_result) -> Optional[InstanceData]:
+    if len(content) < _HEADER_.size:
+        return None
+    magic, *header = _HEADER_.unpack_from(content)
+    file_key, lengths = tuple(header[:4]), header[4:]
+    if magic != _MAGIC_ or file_key != _file_key(stat) or len(content) != _HEADER_.size + 4 * sum(lengths):
+        return None
+    values = struct.unpack_from(f"<{sum(lengths)}i", content, _HEADER_.size)
+    vectors, start = [], 0
+    for length in lengths:
+        vectors.append(list(values[start : start + length]))
+        start += length
+    return InstanceData(*vectors)
+
+
+def _evict(directory: Path) -> None:
+    """Removes the entries written least recently beyond the maximum number of entries"""
+    try:
+        entries = [entry for entry in os.scandir(directory) if entry.name.endswith(_SUFFIX_)]
+        entries.sort(key=lambda entry: entry.stat().st_mtime_ns, reverse=True)
+        for entry in entries[_MAX_ENTRIES_:]:
+            os.remove(entry.path)
+    except OSError:
+        pass
+
+
+def _write_atomically(path: Path, content: bytes) -> None:
+    temporary_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(temporary_path, "wb") as f:
+            f.write(content)
+        os.replace(temporary_path, path)
+    except OSError:
+        # The cache is optional, e.g. the cache directory may be read-only
+        try:
+            os.remove(temporary_path)
+        except OSError:
+            pass
+
+
+def read_data(path: Path, use_cache: bool = True) -> InstanceData:
+    """
+    Reads the vectors of the exemplar in `path` from the cache, parsing the file if its entry is missing or outdated,
+    or always if `use_cache` is False or the cache is turned off
+    """
+    directory = cache_dir() if use_cache else None
+    if directory is None:
+        with open(path, "r") as f:
+            return parse_text(f.read())
+
+    stat = os.stat(path)
+    entry_path = cache_path(path, directory)
+    data = None
+    try:
+        with open(entry_path, "rb") as f:
+            data = _unpack(f.read(), stat)
+    except OSError:
+        pass
+    if data is None:
+        with open(path, "r") as f:
+            data = parse_text(f.read())
+        _write_atomically(entry_path, _pack(data, stat))
+        _evict(directory)
+    return data
+
+
+def read_cached(path: Path, use_cache: bool = True) -> Instance:
+    return build_instance(read_data(path, use_cache))
@@ -0,0 +1,87 @@
+"""
+Synthetic exemplars in the format read by `read_file`, to measure the solver on instances of any size:
+
+    python -m src.instance.generator --patients 400 --operating_rooms 12 --seed 3 --output exemplar.txt
+"""
+import argparse
+import random
+from pathlib import Path
+from typing import Optional, Sequence
+
+from .read_file import _SEPARATOR_, InstanceData
+
+# Priorities go from 1 to the number of weights
+_PRIORITY_WEIGHTS_ = (1, 1, 1, 1, 1)
+# Weights of sex 1 and sex 2
+_SEX_WEIGHTS_ = (1, 1)
+_OPERATION_TIMES_ = (1, 5)
+_URPA_TIMES_ = (1, 3)
+_UCE_TIMES_ = (24, 36, 48, 60, 72)
+
+
+def generate_instance(
+    number_patients: int,
+    number_surgical_types: int = 6,
+    number_operating_rooms: int = 5,
+    seed: int = 0,
+    priority_weights: Sequence[float] = _PRIORITY_WEIGHTS_,
+    sex_weights: Sequence[float] = _SEX_WEIGHTS_,
+    uce_times: Sequence[int] = _UCE_TIMES_,
+    surgical_type_weights: Optional[Sequence[float]] = None,
+) -> InstanceData:
+    """
+    Draws the patients with the given weights of priorities, sexes and surgical types (uniform if not given), and
+    every surgical type its times, with a uce stay among `uce_times`
+    """
+    rng = random.Random(seed)
+    priorities = range(1, len(priority_weights) + 1)
+    surgical_types = range(1, number_surgical_types + 1)
+    return InstanceData(
+        PPr=rng.choices(priorities, weights=priority_weights, k=number_patients),
+        PSe=rng.choices((1, 2), weights=sex_weights, k=number_patients),
+        PTi=rng.choices(surgical_types, weights=surgical_type_weights, k=number_patients),
+        ITIn=[rng.randint(*_OPERATION_TIMES_) for _ in surgical_types],
+        ITAn=[rng.randint(*_URPA_TIMES_) for _ in surgical_types],
+        ITCu=[rng.choice(uce_times) for _ in surgical_types],
+        QTI=[rng.choice(surgical_types) for _ in range(number_operating_rooms)],
+    )
+
+
+def write_instance(path: Path, data: InstanceData) -> None:
+    with open(path, "w") as f:
+        f.write(f"{len(data.PPr)}\n")
+        for vector in data:
+            f.write(_SEPARATOR_.join(str(value) for value in vector) + "\n")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--patients", type=int, required=True)
+    parser.add_argument("--surgical_types", type=int, default=6)
+    parser.add_argument("--operating_rooms", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--priority_weights", type=float, nargs="+", default=_PRIORITY_WEIGHTS_, help="weights of priorities 1, 2, ..."
+    )
+    parser.add_argument("--sex_weights", type=float, nargs=2, default=_SEX_WEIGHTS_, help="weights of sex 1 and 2")
+    parser.add_argument("--uce_times", type=int, nargs="+", default=_UCE_TIMES_, help="hours a uce stay can last")
+    parser.add_argument("--surgical_type_weights", type=float, nargs="+", default=None)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    write_instance(
+        args.output,
+        generate_instance(
+            args.patients,
+            args.surgical_types,
+            args.operating_rooms,
+            args.seed,
+            args.priority_weights,
+            args.sex_weights,
+            args.uce_times,
+            args.surgical_type_weights,
+        ),
+    )
@@ -1,6 +1,7 @@
-from typing import List
+from typing import Dict, List
 
 from .. import portion as P
+from .. import timeline as T
 from ..elements.operating_room import OperatingRoom
 from ..elements.patient import Patient
 from ..elements.uce_room import UceRoom
@@ -30,12 +31,17 @@ class Instance:
         self.operation_interval = _calculate_operation_interval()
         self.uce_rooms = [UceRoom(id_uce=id_uce) for id_uce in range(1, _UCE_ROOMS_ + 1)]
         self.uce_interval = P.closedopen(_UCE_HOUR_OPEN_, _UCE_HOUR_OPEN_ + 24 * _UCE_NUMBER_DAYS_OPEN_)
+        self.operation_mask = T.from_interval(self.operation_interval)
+        self.uce_mask = T.from_interval(self.uce_interval)
+        # Operating rooms by the id of their surgical type
+        self._operating_rooms_by_type: Dict[int, List[OperatingRoom]] = {}
+        for room in operating_rooms:
+            self._operating_rooms_by_type.setdefault(room.surgical_type.id, []).append(room)
 
     def operable_patients(self) -> List[Patient]:
-        set_available_surgical_types = set(room.surgical_type for room in self.operating_rooms)
-        patients = [patient for patient in self.patients if patient.surgical_type in set_available_surgical_types]
+        patients = [patient for patient in self.patients if patient.surgical_type.id in self._operating_rooms_by_type]
         return patients
 
     def feasible_operating_rooms(self, patient: Patient) -> List[OperatingRoom]:
-        rooms = [room for room in self.operating_rooms if room.surgical_type == patient.surgical_type]
-        return rooms
+        rooms = self._operating_rooms_by_type.get(patient.surgical_type.id, [])
+        return list(rooms)
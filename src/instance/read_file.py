@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import List
+from typing import List, NamedTuple
 
 from ..elements.operating_room import OperatingRoom
 from ..elements.patient import Patient
@@ -9,29 +9,36 @@ from .instance import Instance
 _SEPARATOR_ = "*"
 
 
+class InstanceData(NamedTuple):
+    """Vectors of an exemplar, as they are written in its file"""
+
+    # ...patients
+    PPr: List[int]
+    PSe: List[int]
+    PTi: List[int]
+    # ...surgical types
+    ITIn: List[int]
+    ITAn: List[int]
+    ITCu: List[int]
+    # ...operating rooms
+    QTI: List[int]
+
+
 def _parse(line: str) -> List[int]:
     values = [int(value) for value in line.split(_SEPARATOR_)]
     return values
 
 
-def read_file(path: Path) -> Instance:
-    file = open(path, "r")
-    # Read the content of the file...
-    # ...patients
-    _ = int(file.readline())
-    PPr = _parse(file.readline())
-    PSe = _parse(file.readline())
-    PTi = _parse(file.readline())
-    # ...surgical types
-    ITIn = _parse(file.readline())
-    ITAn = _parse(file.readline())
-    ITCu = _parse(file.readline())
-    # ...operating rooms
-    QTI = _parse(file.readline())
-    # Construct and return the instance
+def parse_text(text: str) -> InstanceData:
+    lines = text.splitlines()
+    # The first line is the number of patients
+    return InstanceData(*(_parse(line) for line in lines[1 : 1 + len(InstanceData._fields)]))
+
+
+def build_instance(data: InstanceData) -> Instance:
     surgical_types = [
         SurgicalType(id_st=id_st, operation_time=opet, urpa_time=urpat, uce_time=ucet)
-        for id_st, (opet, urpat, ucet) in enumerate(zip(ITIn, ITAn, ITCu), start=1)
+        for id_st, (opet, urpat, ucet) in enumerate(zip(data.ITIn, data.ITAn, data.ITCu), start=1)
     ]
     dict_surgical_types_by_id = {st.id: st for st in surgical_types}
     patients = [
@@ -41,9 +48,15 @@ def read_file(path: Path) -> Instance:
             sex=sex,
             surgical_type=dict_surgical_types_by_id[st],
         )
-        for id_p, (pr, sex, st) in enumerate(zip(PPr, PSe, PTi), start=1)
+        for id_p, (pr, sex, st) in enumerate(zip(data.PPr, data.PSe, data.PTi), start=1)
     ]
     operating_rooms = [
-        OperatingRoom(id_or=id_or, surgical_type=dict_surgical_types_by_id[st]) for id_or, st in enumerate(QTI, start=1)
+        OperatingRoom(id_or=id_or, surgical_type=dict_surgical_types_by_id[st])
+        for id_or, st in enumerate(data.QTI, start=1)
     ]
     return Instance(patients=patients, operating_rooms=operating_rooms)
+
+
+def read_file(path: Path) -> Instance:
+    with open(path, "r") as file:
+        return build_instance(parse_text(file.read()))
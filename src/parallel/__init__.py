@@ -0,0 +1,3 @@
+from .island import run_islands
+from .scheduler import DeadlineScheduler
+from .worker import DecodedOrder, decode_heuristic, decode_order, init_worker, profiled
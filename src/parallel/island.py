@@ -0,0 +1,145 @@
+"""
+Island model: every process evolves its own population, sending its elite to the next island every few
+generations, and only reports its improvements to the parent.
+"""
+import multiprocessing
+import queue
+import random
+import time
+from array import array
+from pathlib import Path
+from typing import List, Tuple
+
+from ..heuristics import EvolutionaryAlgorithm, FitnessCache
+from ..instance.instance import Instance
+from ..profiling import PROFILER
+from ..solution import SOLUTION_PARAMETERS_LIST, Result, Solution
+from .scheduler import DeadlineScheduler
+from .worker import decode_order, init_worker
+
+_MIGRATION_INTERVAL_ = 5
+
+
+def _run_island(
+    island_index: int,
+    path_input: Path,
+    population: List[Tuple[List[int], float]],
+    parameters_index: int,
+    crossover: str,
+    deadline: float,
+    inbound: multiprocessing.Queue,
+    outbound: multiprocessing.Queue,
+    improvements: multiprocessing.Queue,
+    statistics: multiprocessing.Queue,
+    stop: multiprocessing.Event,
+    profile: bool,
+) -> None:
+    PROFILER.enabled = profile
+    init_worker(path_input)
+    rng = random.Random(island_index)
+    # Migrants still in flight when the island stops can be dropped
+    outbound.cancel_join_thread()
+    fitness_cache = FitnessCache()
+    scheduler = DeadlineScheduler(deadline - time.time())
+    best_value = max(value for _, value in population)
+    generation = 0
+    try:
+        while scheduler.fits() and not stop.is_set():
+            optimization = EvolutionaryAlgorithm(population, crossover, rng)
+            population = []
+            for child in optimization.get_population():
+                value = fitness_cache.get(child, parameters_index)
+                if value is None:
+                    if not scheduler.fits():
+                        return
+                    started = time.time()
+                    _, value, compact_solution = decode_order((path_input, array("H", child), parameters_index))
+                    scheduler.record(time.time() - started)
+                    fitness_cache.put(child, parameters_index, value)
+                    if value > best_value:
+                        best_value = value
+                        improvements.put((value, compact_solution))
+                population.append((child, value))
+            population.append(optimization.get_best_exemplar())
+
+            generation += 1
+            if generation % _MIGRATION_INTERVAL_ == 0:
+                outbound.put(max(population, key=lambda individual: individual[1]))
+                # Migrants replace the worst individuals
+                while True:
+                    try:
+                        migrant = inbound.get_nowait()
+                    except queue.Empty:
+                        break
+                    worst = min(range(len(population)), key=lambda idx: population[idx][1])
+                    population[worst] = migrant
+    finally:
+        statistics.put((fitness_cache.hits, fitness_cache.misses, PROFILER.pop()))
+
+
+def run_islands(
+    number_islands: int,
+    path_input: Path,
+    population: List[Tuple[List[int], float]],
+    parameters_index: int,
+    crossover: str,
+    deadline: float,
+    result: Result,
+    cpu_time: float,
+    instance: Instance,
+    fitness_cache: FitnessCache,
+) -> None:
+    # Island i sends its elite to island i + 1
+    migrations = [multiprocessing.Queue() for _ in range(number_islands)]
+    improvements: multiprocessing.Queue = multiprocessing.Queue()
+    statistics: multiprocessing.Queue = multiprocessing.Queue()
+    stop = multiprocessing.Event()
+    islands = [
+        multiprocessing.Process(
+            target=_run_island,
+            args=(
+                island_index,
+                path_input,
+                population,
+                parameters_index,
+                crossover,
+                deadline,
+                migrations[island_index - 1],
+                migrations[island_index],
+                improvements,
+                statistics,
+                stop,
+                PROFILER.enabled,
+            ),
+            daemon=True,
+        )
+        for island_index in range(number_islands)
+    ]
+    for island in islands:
+        island.start()
+
+    while any(island.is_alive() for island in islands) or not improvements.empty():
+        if time.time() >= deadline:
+            stop.set()
+        result.flush_if_due()
+        try:
+            value, compact_solution = improvements.get(timeout=0.1)
+        except queue.Empty:
+            continue
+        if result.best_sol is None or result.best_sol.value() < value:
+            result.add_improvement(value, int(time.time() - cpu_time))
+            result.add_best(
+                Solution.from_compact(instance, compact_solution, SOLUTION_PARAMETERS_LIST[parameters_index])
+            )
+
+    for island in islands:
+        island.join()
+    # Each island has its own cache, only their counters are gathered, along with their measures
+    while True:
+        try:
+            hits, misses, profile = statistics.get(timeout=0.1)
+        except queue.Empty:
+            break
+        fitness_cache.hits += hits
+        fitness_cache.misses += misses
+        PROFILER.merge(profile)
@@ -0,0 +1,72 @@
+import queue
+import time
+from multiprocessing.pool import Pool
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+# Weight of the last decode in the estimation of the cost of a decode
+_SMOOTHING_ = 0.2
+
+
+class DeadlineScheduler:
+    """
+    Runs decodes on a pool without going beyond a deadline. The cost of a decode is estimated online, and a task is
+    only started if it is expected to end before the deadline.
+    """
+
+    def __init__(self, time_budget: float, start: Optional[float] = None, processes: int = 1) -> None:
+        self.start = start if start is not None else time.time()
+        self.deadline = self.start + time_budget
+        self.processes = processes
+        self.decode_time: Optional[float] = None
+
+    def remaining(self) -> float:
+        return self.deadline - time.time()
+
+    def fits(self, number_decodes: int = 1) -> bool:
+        """Checks if `number_decodes` decodes per process are expected to end before the deadline"""
+        expected_time = number_decodes * self.decode_time if self.decode_time is not None else 0
+        return expected_time < self.remaining()
+
+    def record(self, elapsed: float) -> None:
+        if self.decode_time is None:
+            self.decode_time = elapsed
+        else:
+            self.decode_time = (1 - _SMOOTHING_) * self.decode_time + _SMOOTHING_ * elapsed
+
+    def map(
+        self, pool: Pool, func: Callable[[Any], Any], tasks: Sequence[Any], keep_deadline: bool = True
+    ) -> List[Any]:
+        """
+        Like `pool.map`, keeping one task per process in flight: a new task starts as soon as any of them ends. With
+        `keep_deadline`, the tasks that would end after the deadline are not started, so the results only cover a
+        prefix of `tasks`.
+        """
+        results: List[Any] = [None] * len(tasks)
+        # Index, seconds taken and outcome of the tasks, in the order they end
+        ended: "queue.SimpleQueue[Tuple[int, float, bool, Any]]" = queue.SimpleQueue()
+        next_task = 0
+        in_flight = 0
+        while next_task < len(tasks) or in_flight:
+            while next_task < len(tasks) and in_flight < self.processes and (not keep_deadline or self.fits()):
+                self._start(pool, func, tasks[next_task], next_task, ended)
+                next_task += 1
+                in_flight += 1
+            if not in_flight:
+                break
+            idx, elapsed, succeeded, outcome = ended.get()
+            in_flight -= 1
+            if not succeeded:
+                raise outcome
+            results[idx] = outcome
+            self.record(elapsed)
+        return results[:next_task]
+
+    @staticmethod
+    def _start(pool: Pool, func: Callable[[Any], Any], task: Any, idx: int, ended: queue.SimpleQueue) -> None:
+        started = time.time()
+        pool.apply_async(
+            func,
+            (task,),
+            callback=lambda outcome: ended.put((idx, time.time() - started, True, outcome)),
+            error_callback=lambda error: ended.put((idx, time.time() - started, False, error)),
+        )
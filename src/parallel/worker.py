@@ -0,0 +1,84 @@
+"""
+Tasks run by the processes of the solver pool. Each process loads an instance once, when it is first needed or in
+`init_worker`, and then only receives the path of the exemplar, heuristics or orders of patient ids and the index of
+the SolutionParameters to use. Decoded solutions travel back as their value and `Solution.compact`, to be rebuilt
+only if they are needed.
+"""
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, NamedTuple, Tuple
+
+from ..elements.patient import Patient
+from ..heuristics import HeuristicBase, PredefinedOrder
+from ..instance import get_instance
+from ..instance.instance import Instance
+from ..profiling import PROFILER, Profiler
+from ..solution import SOLUTION_PARAMETERS_LIST, DecodingCheckpoints, Solution
+
+# Instances kept by each process, so that a pool can be shared by the exemplars of a batch
+_MAX_INSTANCES_ = 8
+
+# Order of patient ids, value of its solution and its assignments as given by Solution.compact
+DecodedOrder = Tuple[array, float, array]
+
+
+class _LoadedInstance(NamedTuple):
+    instance: Instance
+    patients_by_id: Dict[int, Patient]
+    # Decodings done by this process, reused by the orders that share a prefix with them
+    decoding_checkpoints: DecodingCheckpoints
+
+
+_loaded_instances: "OrderedDict[Path, _LoadedInstance]" = OrderedDict()
+
+
+def _load(path_input: Path) -> _LoadedInstance:
+    path_input = Path(path_input)
+    loaded = _loaded_instances.get(path_input)
+    if loaded is None:
+        with PROFILER.stage("get_instance"):
+            instance = get_instance(path_input)
+        loaded = _LoadedInstance(
+            instance=instance,
+            patients_by_id={patient.id: patient for patient in instance.patients},
+            decoding_checkpoints=DecodingCheckpoints(),
+        )
+        _loaded_instances[path_input] = loaded
+        if len(_loaded_instances) > _MAX_INSTANCES_:
+            _loaded_instances.popitem(last=False)
+    _loaded_instances.move_to_end(path_input)
+    return loaded
+
+
+def init_worker(*paths_input: Path) -> None:
+    for path_input in paths_input:
+        _load(path_input)
+
+
+def _decode(loaded: _LoadedInstance, heuristic: HeuristicBase, parameters_index: int) -> DecodedOrder:
+    solution = Solution(loaded.instance, SOLUTION_PARAMETERS_LIST[parameters_index])
+    patients_order = solution.find_solution(heuristic, loaded.decoding_checkpoints)
+    return array("H", (patient.id for patient in patients_order)), solution.value(), solution.compact()
+
+
+def decode_heuristic(task: Tuple[Path, HeuristicBase, int]) -> DecodedOrder:
+    path_input, heuristic, parameters_index = task
+    return _decode(_load(path_input), heuristic, parameters_index)
+
+
+def profiled(task: Tuple[Callable[[Any], Any], Any]) -> Tuple[Any, Profiler]:
+    """Runs a task with the profiler of the process enabled, and returns its measures along with the result"""
+    func, arguments = task
+    PROFILER.enabled = True
+    try:
+        return func(arguments), PROFILER.pop()
+    finally:
+        PROFILER.enabled = False
+
+
+def decode_order(task: Tuple[Path, array, int]) -> DecodedOrder:
+    path_input, order, parameters_index = task
+    loaded = _load(path_input)
+    heuristic = PredefinedOrder([loaded.patients_by_id[id_patient] for id_patient in order])
+    return _decode(loaded, heuristic, parameters_index)
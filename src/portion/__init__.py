@@ -3,6 +3,7 @@ from .const import Bound, inf
 from .dict import IntervalDict
 from .func import closed, closedopen, empty, iterate, open, openclosed, singleton
 from .interval import AbstractDiscreteInterval, Interval
+from .intinterval import IntInterval, IntIntervalSet
 from .io import from_data, from_string, to_data, to_string
 
 __all__ = [
@@ -12,6 +13,8 @@ __all__ = [
     "OPEN",
     "Interval",
     "AbstractDiscreteInterval",
+    "IntInterval",
+    "IntIntervalSet",
     "open",
     "closed",
     "openclosed",
@@ -495,9 +495,51 @@ class Interval:
 
         return self.__class__(*complements)
 
+    def _difference(self, other):
+        """
+        Atomic intervals of self that are not in other. Both lists of atomic intervals are sorted, so a single sweep
+        over them is enough and the complement of other is never built.
+
+        :param other: an interval.
+        :return: a sorted list of disjoint, non mergeable atomic intervals.
+        """
+        others = other._intervals
+        difference = []
+        j = 0
+        for left, lower, upper, right in self._intervals:
+            # Skip the intervals of other that end before this one starts
+            while j < len(others) and (
+                others[j].upper < lower
+                or (others[j].upper == lower and (others[j].right == Bound.OPEN or left == Bound.OPEN))
+            ):
+                j += 1
+
+            k = j
+            remaining = True
+            while k < len(others) and (
+                others[k].lower < upper
+                or (others[k].lower == upper and others[k].left == Bound.CLOSED and right == Bound.CLOSED)
+            ):
+                removed = others[k]
+                # Part before the removed interval
+                difference.extend(self.__class__.from_atomic(left, lower, removed.lower, ~removed.left)._intervals)
+                if removed.upper > upper or (
+                    removed.upper == upper and (removed.right == Bound.CLOSED or right == Bound.OPEN)
+                ):
+                    remaining = False
+                    break
+                left, lower = ~removed.right, removed.upper
+                k += 1
+
+            if remaining:
+                difference.extend(self.__class__.from_atomic(left, lower, upper, right)._intervals)
+        return difference
+
     def __sub__(self, other):
         if isinstance(other, Interval):
-            return self & ~other
+            difference = self.__class__()
+            difference._intervals = self._difference(other)
+            return difference
         else:
             return NotImplemented
 
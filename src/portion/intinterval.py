@@ -0,0 +1,164 @@
+from bisect import bisect_right
+from typing import Callable, Iterator, List, Union
+
+from .const import Bound, inf
+from .interval import Interval
+
+# Sentinel after the bounds of a list that has been swept
+_END_ = float("inf")
+
+
+def _combine(a: List[int], b: List[int], keep: Callable[[bool, bool], bool]) -> List[int]:
+    """
+    Merges two sorted lists of bounds, keeping the integers for which `keep(in a, in b)` holds. Both lists are
+    swept once, and the bounds that come out are already normalized.
+    """
+    bounds: List[int] = []
+    i = j = 0
+    inside = False
+    while i < len(a) or j < len(b):
+        value = min(a[i] if i < len(a) else _END_, b[j] if j < len(b) else _END_)
+        if i < len(a) and a[i] == value:
+            i += 1
+        if j < len(b) and b[j] == value:
+            j += 1
+        # An odd number of bounds consumed means the next integers are inside
+        now = keep(i % 2 == 1, j % 2 == 1)
+        if now != inside:
+            bounds.append(value)
+            inside = now
+    return bounds
+
+
+def _difference(in_first: bool, in_second: bool) -> bool:
+    return in_first and not in_second
+
+
+class IntIntervalSet:
+    """
+    Union of half-open intervals [lower, upper) of integers. It is stored as a sorted list of bounds
+    [lower_0, upper_0, lower_1, upper_1, ...] of disjoint and non-adjacent intervals, so that union, intersection
+    and difference are single merges of the two lists.
+    """
+
+    __slots__ = ("_bounds",)
+
+    def __init__(self, *intervals: "IntIntervalSet") -> None:
+        pieces = []
+        for interval in intervals:
+            if not isinstance(interval, IntIntervalSet):
+                raise TypeError("Parameters must be IntIntervalSet instances")
+            pieces.extend(zip(interval._bounds[::2], interval._bounds[1::2]))
+        pieces.sort()
+        # Sorted by lower bound, each piece either extends the last one or starts a new one
+        self._bounds: List[int] = []
+        for lower, upper in pieces:
+            if self._bounds and lower <= self._bounds[-1]:
+                self._bounds[-1] = max(self._bounds[-1], upper)
+            else:
+                self._bounds.extend((lower, upper))
+
+    @classmethod
+    def _from_bounds(cls, bounds: List[int]) -> "IntIntervalSet":
+        instance = IntIntervalSet.__new__(IntIntervalSet)
+        instance._bounds = bounds
+        return instance
+
+    @classmethod
+    def from_interval(cls, interval: Interval) -> "IntIntervalSet":
+        """Integers of a portion interval, which must have finite bounds"""
+        pieces = []
+        for atomic in interval._intervals:
+            lower = atomic.lower if atomic.left == Bound.CLOSED else atomic.lower + 1
+            upper = atomic.upper + 1 if atomic.right == Bound.CLOSED else atomic.upper
+            pieces.append(IntInterval(lower, upper))
+        return cls(*pieces)
+
+    def to_interval(self) -> Interval:
+        return Interval(
+            *(
+                Interval.from_atomic(Bound.CLOSED, lower, upper, Bound.OPEN)
+                for lower, upper in zip(self._bounds[::2], self._bounds[1::2])
+            )
+        )
+
+    @property
+    def lower(self):
+        """Lowest integer, inf if empty"""
+        return self._bounds[0] if self._bounds else inf
+
+    @property
+    def upper(self):
+        """Bound after the highest integer, -inf if empty"""
+        return self._bounds[-1] if self._bounds else -inf
+
+    @property
+    def empty(self) -> bool:
+        return not self._bounds
+
+    @property
+    def atomic(self) -> bool:
+        return len(self._bounds) <= 2
+
+    def overlaps(self, other: "IntIntervalSet") -> bool:
+        return not (self & other).empty
+
+    def contains(self, item: Union[int, "IntIntervalSet"]) -> bool:
+        return item in self
+
+    def __len__(self) -> int:
+        return len(self._bounds) // 2
+
+    def __iter__(self) -> Iterator["IntInterval"]:
+        for lower, upper in zip(self._bounds[::2], self._bounds[1::2]):
+            yield IntInterval(lower, upper)
+
+    def __getitem__(self, item: int) -> "IntInterval":
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError("IntIntervalSet index out of range")
+        return IntInterval(self._bounds[2 * item], self._bounds[2 * item + 1])
+
+    def __contains__(self, item: Union[int, "IntIntervalSet"]) -> bool:
+        if isinstance(item, IntIntervalSet):
+            return not _combine(item._bounds, self._bounds, _difference)
+        # Integers inside are preceded by an odd number of bounds
+        return bisect_right(self._bounds, item) % 2 == 1
+
+    def __and__(self, other: "IntIntervalSet") -> "IntIntervalSet":
+        if not isinstance(other, IntIntervalSet):
+            return NotImplemented
+        return self._from_bounds(_combine(self._bounds, other._bounds, bool.__and__))
+
+    def __or__(self, other: "IntIntervalSet") -> "IntIntervalSet":
+        if not isinstance(other, IntIntervalSet):
+            return NotImplemented
+        return self._from_bounds(_combine(self._bounds, other._bounds, bool.__or__))
+
+    def __sub__(self, other: "IntIntervalSet") -> "IntIntervalSet":
+        if not isinstance(other, IntIntervalSet):
+            return NotImplemented
+        return self._from_bounds(_combine(self._bounds, other._bounds, _difference))
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, IntIntervalSet):
+            return NotImplemented
+        return self._bounds == other._bounds
+
+    def __hash__(self) -> int:
+        return hash(tuple(self._bounds))
+
+    def __repr__(self) -> str:
+        if self.empty:
+            return "()"
+        return " | ".join(f"[{lower},{upper})" for lower, upper in zip(self._bounds[::2], self._bounds[1::2]))
+
+
+class IntInterval(IntIntervalSet):
+    """Half-open interval [lower, upper) of integers, empty if upper <= lower"""
+
+    __slots__ = ()
+
+    def __init__(self, lower: int, upper: int) -> None:
+        self._bounds = [lower, upper] if lower < upper else []
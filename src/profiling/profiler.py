@@ -0,0 +1,90 @@
+"""
+Opt-in measures of the stages of the solver. Every process has its own `PROFILER`, disabled by default, which adds up
+the time and the calls of each stage and the samples of its counters. The measures of the worker processes travel
+back with their results and are merged into the profiler of the parent:
+
+    with PROFILER.stage("find_available_ors"):
+        ...
+    PROFILER.count("candidates per assign_patient", number_candidates)
+
+Stages can be nested, and the time of a stage includes the one of the stages inside it.
+"""
+import threading
+import time
+from contextlib import nullcontext
+from typing import ContextManager, Dict, List
+
+_NULL_STAGE_ = nullcontext()
+# The threads solving several exemplars merge the measures of their tasks into the same profiler
+_MERGE_LOCK_ = threading.Lock()
+
+
+class _Stage:
+    __slots__ = ("stages", "name", "started")
+
+    def __init__(self, stages: Dict[str, List[float]], name: str) -> None:
+        self.stages = stages
+        self.name = name
+        self.started = 0.0
+
+    def __enter__(self) -> None:
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        elapsed = time.perf_counter() - self.started
+        measures = self.stages.get(self.name)
+        if measures is None:
+            self.stages[self.name] = [1, elapsed]
+        else:
+            measures[0] += 1
+            measures[1] += elapsed
+
+
+class Profiler:
+    def __init__(self) -> None:
+        self.enabled = False
+        # Calls and seconds of each stage
+        self.stages: Dict[str, List[float]] = {}
+        # Samples and total of each counter
+        self.counters: Dict[str, List[int]] = {}
+
+    def stage(self, name: str) -> ContextManager[None]:
+        return _Stage(self.stages, name) if self.enabled else _NULL_STAGE_
+
+    def count(self, name: str, number: int = 1) -> None:
+        if self.enabled:
+            measures = self.counters.setdefault(name, [0, 0])
+            measures[0] += 1
+            measures[1] += number
+
+    def merge(self, other: "Profiler") -> None:
+        with _MERGE_LOCK_:
+            for name, (calls, seconds) in other.stages.items():
+                measures = self.stages.setdefault(name, [0, 0.0])
+                measures[0] += calls
+                measures[1] += seconds
+            for name, (samples, total) in other.counters.items():
+                measures = self.counters.setdefault(name, [0, 0])
+                measures[0] += samples
+                measures[1] += total
+
+    def pop(self) -> "Profiler":
+        """Returns the measures taken so far and starts again from none"""
+        measures = Profiler()
+        measures.stages, measures.counters = self.stages, self.counters
+        self.stages, self.counters = {}, {}
+        return measures
+
+    def report(self) -> str:
+        lines = [f"{'stage':<28}{'calls':>12}{'seconds':>12}{'us/call':>12}"]
+        for name, (calls, seconds) in sorted(self.stages.items(), key=lambda item: -item[1][1]):
+            lines.append(f"{name:<28}{calls:>12}{seconds:>12.3f}{seconds / calls * 1e6:>12.1f}")
+        if self.counters:
+            lines.append(f"{'counter':<40}{'samples':>12}{'mean':>12}")
+            for name, (samples, total) in sorted(self.counters.items()):
+                lines.append(f"{name:<40}{samples:>12}{total / samples:>12.1f}")
+        return "\n".join(lines)
+
+
+# Profiler of this process
+PROFILER = Profiler()
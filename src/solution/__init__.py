@@ -1,2 +1,3 @@
+from .decoding import DecodingCheckpoints
 from .result import Result
 from .solution import SOLUTION_PARAMETERS_LIST, Solution, SolutionParameters
@@ -1,4 +1,5 @@
 from .. import portion as P
+from .. import timeline as T
 from ..elements.operating_room import OperatingRoom
 from ..elements.patient import Patient
 from ..elements.uce_room import UceRoom
@@ -15,24 +16,43 @@ class Assignment:
     ):
         self.patient: Patient = patient
         self.operating_room: OperatingRoom = operating_room
-        self.operation_interval: P.interval = P.closedopen(
-            operation_start, operation_start + patient.surgical_type.operation_time
-        )
-        self.operation_cleaning_interval: P.interval = P.closedopen(
-            operation_start,
-            operation_start + patient.surgical_type.operation_time + patient.surgical_type.cleaning_time,
-        )
+        self.operation_start: int = operation_start
+        self.operation_end: int = operation_start + patient.surgical_type.operation_time
+        self.cleaning_end: int = operation_start + patient.operation_cleaning_time
         self.uce_room: UceRoom = uce_room
-        self.uce_interval: P.interval = P.closedopen(uce_start, uce_start + patient.surgical_type.uce_time)
+        self.uce_start: int = uce_start
+        self.uce_end: int = uce_start + patient.surgical_type.uce_time
+        self.operation_cleaning_mask: int = T.closedopen(self.operation_start, self.cleaning_end)
+        self.uce_mask: int = T.closedopen(self.uce_start, self.uce_end)
 
     @property
-    def urpa_interval(self) -> P.Interval:
-        return P.closedopen(self.operation_interval.upper, self.uce_interval.lower)
+    def operation_mask(self) -> int:
+        return T.closedopen(self.operation_start, self.operation_end)
 
     @property
-    def cleaning_interval(self) -> P.Interval:
+    def cleaning_mask(self) -> int:
+        return T.closedopen(self.operation_end, self.cleaning_end)
+
+    @property
+    def operation_interval(self) -> P.IntIntervalSet:
+        return P.IntInterval(self.operation_start, self.operation_end)
+
+    @property
+    def operation_cleaning_interval(self) -> P.IntIntervalSet:
+        return P.IntInterval(self.operation_start, self.cleaning_end)
+
+    @property
+    def uce_interval(self) -> P.IntIntervalSet:
+        return P.IntInterval(self.uce_start, self.uce_end)
+
+    @property
+    def urpa_interval(self) -> P.IntIntervalSet:
+        return P.IntInterval(self.operation_end, self.uce_start)
+
+    @property
+    def cleaning_interval(self) -> P.IntIntervalSet:
         return self.operation_cleaning_interval - self.operation_interval
 
     @property
     def waiting_time(self) -> int:
-        return self.uce_interval.lower - (self.operation_interval.upper + self.patient.surgical_type.urpa_time)
+        return self.uce_start - (self.operation_end + self.patient.surgical_type.urpa_time)
@@ -1,14 +1,60 @@
 from abc import abstractmethod
+from typing import Optional
 
-from ..portion import Interval
+from ..elements.operating_room import OperatingRoom
+from ..elements.patient import Patient
+from ..elements.uce_room import UceRoom
+from ..timeline import Slot
 from .assignment import Assignment
 
 
+class CandidateBatch:
+    """
+    Candidate assignments of a patient operated at `operation_start` in `operating_room` that only differ in the
+    hour they enter `uce_room`, which ranges over `uce_starts` inside the free slot `uce_slot`
+    """
+
+    __slots__ = ("patient", "operating_room", "operation_start", "uce_room", "uce_slot", "uce_starts")
+
+    def __init__(
+        self,
+        patient: Patient,
+        operating_room: OperatingRoom,
+        operation_start: int,
+        uce_room: UceRoom,
+        uce_slot: Slot,
+        uce_starts: range,
+    ):
+        self.patient: Patient = patient
+        self.operating_room: OperatingRoom = operating_room
+        self.operation_start: int = operation_start
+        self.uce_room: UceRoom = uce_room
+        self.uce_slot: Slot = uce_slot
+        self.uce_starts: range = uce_starts
+
+    def assignment(self, uce_start: int) -> Assignment:
+        return Assignment(
+            patient=self.patient,
+            operating_room=self.operating_room,
+            operation_start=self.operation_start,
+            uce_room=self.uce_room,
+            uce_start=uce_start,
+        )
+
+
 class Criterion:
     def __init__(self) -> None:
-        self.best_assignment = None
+        # Either the best assignment or the (batch, uce start) pair it is built from when it is needed
+        self._best = None
         self._criterion = None
 
+    @property
+    def best_assignment(self) -> Optional[Assignment]:
+        if isinstance(self._best, tuple):
+            batch, uce_start = self._best
+            self._best = batch.assignment(uce_start)
+        return self._best
+
     @property
     def criterion(self):
         return self._criterion
@@ -21,11 +67,19 @@ class Criterion:
     def evaluate(self, assignment: Assignment, *args, **kwargs):
         """Checks if the assignment is better than the best assignment"""
 
+    @abstractmethod
+    def evaluate_batch(self, batch: CandidateBatch):
+        """Checks the candidates of the batch in increasing uce start, as `evaluate` would one by one"""
+
     def is_first_assignment(self) -> bool:
-        return self.best_assignment is None
+        return self._best is None
 
     def update(self, assignment: Assignment, criterion: int):
-        self.best_assignment = assignment
+        self._best = assignment
+        self._criterion = criterion
+
+    def update_batch(self, batch: CandidateBatch, uce_start: int, criterion: int):
+        self._best = (batch, uce_start)
         self._criterion = criterion
 
 
@@ -36,10 +90,19 @@ class MinTime(Criterion):
         self.maximum_starting_time = maximum_starting_time if maximum_starting_time != 0 else float("inf")
 
     def evaluate(self, assignment: Assignment, *args, **kwargs):
-        if assignment.uce_interval.lower > self.maximum_starting_time:
+        if assignment.uce_start > self.maximum_starting_time:
             return
-        if self.is_first_assignment() or self._criterion >= assignment.uce_interval.lower:
-            self.update(assignment, assignment.operation_interval.lower)
+        if self.is_first_assignment() or self._criterion >= assignment.uce_start:
+            self.update(assignment, assignment.operation_start)
+
+    def evaluate_batch(self, batch: CandidateBatch):
+        first = batch.uce_starts.start
+        last = min(batch.uce_starts.stop - 1, self.maximum_starting_time)
+        if first > last:
+            return
+        if self.is_first_assignment() or self._criterion >= first:
+            # The following starts keep replacing it while they do not exceed the operation start
+            self.update_batch(batch, max(first, min(last, batch.operation_start)), batch.operation_start)
 
 
 class MaxTime(Criterion):
@@ -49,10 +112,20 @@ class MaxTime(Criterion):
         self.minimum_end_time = minimum_end_time
 
     def evaluate(self, assignment: Assignment, *args, **kwargs):
-        if assignment.uce_interval.upper < self.minimum_end_time:
+        if assignment.uce_end < self.minimum_end_time:
             return
-        if self.is_first_assignment() or self._criterion < assignment.uce_interval.lower:
-            self.update(assignment, assignment.operation_interval.lower)
+        if self.is_first_assignment() or self._criterion < assignment.uce_start:
+            self.update(assignment, assignment.operation_start)
+
+    def evaluate_batch(self, batch: CandidateBatch):
+        first = max(batch.uce_starts.start, self.minimum_end_time - batch.patient.surgical_type.uce_time)
+        if not self.is_first_assignment():
+            first = max(first, self._criterion + 1)
+        last = batch.uce_starts.stop - 1
+        if first > last:
+            return
+        # Once the first one is taken, every later start after the operation start replaces it
+        self.update_batch(batch, last if last > batch.operation_start else first, batch.operation_start)
 
 
 class MinWhiteSpaces(Criterion):
@@ -60,14 +133,26 @@ class MinWhiteSpaces(Criterion):
         super().__init__()
         self._criterion: int = float("inf")
 
-    def evaluate(self, assignment: Assignment, uce_interval: Interval):
-        distance_to_start = abs(assignment.operation_interval.lower - uce_interval.lower)
-        distance_to_end = abs(assignment.operation_interval.upper - uce_interval.upper)
+    @staticmethod
+    def blanks(operation_start: int, operation_end: int, uce_interval: Slot) -> int:
+        distance_to_start = abs(operation_start - uce_interval.lower)
+        distance_to_end = abs(operation_end - uce_interval.upper)
         if uce_interval.lower == 12 and uce_interval.upper != 156:
-            blanks = distance_to_end
+            return distance_to_end
         elif uce_interval.upper == 156 and uce_interval.lower != 12:
-            blanks = distance_to_start
-        else:
-            blanks = min(distance_to_start, distance_to_end)
+            return distance_to_start
+        return min(distance_to_start, distance_to_end)
+
+    def evaluate(self, assignment: Assignment, uce_interval: Slot):
+        blanks = self.blanks(assignment.operation_start, assignment.operation_end, uce_interval)
         if self.is_first_assignment() or self._criterion > blanks:
             self.update(assignment, blanks)
+
+    def evaluate_batch(self, batch: CandidateBatch):
+        if not batch.uce_starts:
+            return
+        operation_end = batch.operation_start + batch.patient.surgical_type.operation_time
+        blanks = self.blanks(batch.operation_start, operation_end, batch.uce_slot)
+        # Every candidate of the batch has the same blanks, so only the first one can improve
+        if self.is_first_assignment() or self._criterion > blanks:
+            self.update_batch(batch, batch.uce_starts.start, blanks)
@@ -0,0 +1,86 @@
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, NamedTuple, Optional, Sequence, Tuple
+
+from .assignment import Assignment
+from .criterion import Criterion
+
+
+class DecodingPass(NamedTuple):
+    """One sweep of the greedy decoder over the patients order"""
+
+    phase: str
+    criterion: Callable[[], Criterion]
+    uce_time: int = 0
+    limit: Optional[int] = None
+
+
+class Checkpoint(NamedTuple):
+    """
+    State of the greedy decoder before visiting `position` in the pass `pass_index`. It only depends on the first
+    `prefix` patients of the order and on its first `number_assignments` assignments.
+    """
+
+    pass_index: int
+    position: int
+    phase_assignments: int
+    number_assignments: int
+    prefix: int
+
+
+class _DecodedOrder(NamedTuple):
+    order: Tuple[int, ...]
+    checkpoints: List[Checkpoint]
+    prefixes: List[int]
+    assignments: List[Assignment]
+
+
+def _common_prefix(order_1: Sequence[int], order_2: Sequence[int]) -> int:
+    low, high = 0, min(len(order_1), len(order_2))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if order_1[:middle] == order_2[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+class DecodingCheckpoints:
+    """
+    Checkpoints of the last decoded orders, so that an order sharing a prefix with one of them resumes the greedy
+    decoder from the furthest checkpoint that only depends on that prefix
+    """
+
+    def __init__(self, max_orders: int = 64) -> None:
+        self.max_orders = max_orders
+        self._decoded: Dict[Hashable, "OrderedDict[Tuple[int, ...], _DecodedOrder]"] = {}
+
+    def find(self, key: Hashable, order: Tuple[int, ...]) -> Tuple[List[Checkpoint], List[Assignment]]:
+        """Returns the checkpoints up to the furthest reusable one and the assignments done until it"""
+        best_decoded, best_idx, best_progress = None, 0, (-1, -1)
+        for decoded in self._decoded.get(key, {}).values():
+            idx = bisect_right(decoded.prefixes, _common_prefix(order, decoded.order))
+            if idx == 0:
+                continue
+            checkpoint = decoded.checkpoints[idx - 1]
+            if (checkpoint.pass_index, checkpoint.position) > best_progress:
+                best_decoded, best_idx, best_progress = decoded, idx, (checkpoint.pass_index, checkpoint.position)
+        if best_decoded is None:
+            return [], []
+        checkpoints = best_decoded.checkpoints[:best_idx]
+        return checkpoints, best_decoded.assignments[: checkpoints[-1].number_assignments]
+
+    def store(
+        self, key: Hashable, order: Tuple[int, ...], checkpoints: List[Checkpoint], assignments: List[Assignment]
+    ) -> None:
+        decoded_orders = self._decoded.setdefault(key, OrderedDict())
+        decoded_orders[order] = _DecodedOrder(
+            order=order,
+            checkpoints=checkpoints,
+            prefixes=[checkpoint.prefix for checkpoint in checkpoints],
+            assignments=list(assignments),
+        )
+        decoded_orders.move_to_end(order)
+        if len(decoded_orders) > self.max_orders:
+            decoded_orders.popitem(last=False)
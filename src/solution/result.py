@@ -1,8 +1,13 @@
+import os
+import time
+from pathlib import Path
 from typing import List, Optional
 
 from .solution import Solution
 
 _SEPARATOR_ = "*"
+# Minimum seconds between two writes of the output file
+_CHECKPOINT_INTERVAL_ = 1.0
 
 
 class ResultImprovement:
@@ -10,23 +15,71 @@ class ResultImprovement:
         self.of: float = of
         self.cpu_time: float = cpu_time
 
+    def __str__(self) -> str:
+        return str(self.of) + _SEPARATOR_ + str(self.cpu_time)
+
 
 class Result:
-    def __init__(self):
+    """
+    Improvements found and best solution. Given `path_output`, every new best solution is written to it, at most
+    once every `checkpoint_interval` seconds, by replacing the file with a complete one. The file can be read with
+    `read_file` at any time. A best solution held back by the interval is written by the next `flush_if_due` after
+    the interval ends, so callers have to call it regularly.
+    """
+
+    def __init__(self, path_output: Optional[Path] = None, checkpoint_interval: float = _CHECKPOINT_INTERVAL_):
         self.improvements: List[ResultImprovement] = []
         self.best_sol: Optional[Solution] = None
+        self.path_output = Path(path_output) if path_output is not None else None
+        self.checkpoint_interval = checkpoint_interval
+        self._last_checkpoint: Optional[float] = None
+        # Whether the file misses the last best solution
+        self._pending = False
 
     def add_improvement(self, of: float, cpu_time: float) -> None:
         self.improvements.append(ResultImprovement(of=of, cpu_time=cpu_time))
 
     def add_best(self, sol: Solution) -> None:
         self.best_sol = sol
+        if self.path_output is not None and self.improvements:
+            self._pending = True
+            self.flush_if_due()
+
+    def flush_if_due(self) -> None:
+        """Writes the last best solution if it was not written yet and the checkpoint interval is over"""
+        if self._pending and (
+            self._last_checkpoint is None or time.monotonic() - self._last_checkpoint >= self.checkpoint_interval
+        ):
+            self.checkpoint()
+
+    def checkpoint(self) -> None:
+        """Writes the result to a temporary file that then replaces the output file, so it is never half written"""
+        temporary_path = self.path_output.with_name(f".{self.path_output.name}.{os.getpid()}.tmp")
+        with open(temporary_path, "w") as f:
+            f.write(str(self))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary_path, self.path_output)
+        # The rename itself is only durable once the directory is on disk
+        directory = os.open(self.path_output.parent, os.O_RDONLY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+        self._last_checkpoint = time.monotonic()
+        self._pending = False
+
+    def close(self) -> None:
+        """Writes the best solution if the last one was held back by the checkpoint interval"""
+        if self._pending:
+            self.checkpoint()
 
     def __str__(self) -> str:
-        result_str = ""
-        for improvement in self.improvements:
-            result_str += str(improvement.of) + _SEPARATOR_ + str(improvement.cpu_time) + "\n"
-        result_str += str(len(self.improvements) - 1) + "\n"
-        result_str += str(self.improvements[-1].of) + _SEPARATOR_ + str(self.improvements[-1].cpu_time) + "\n"
-        result_str += str(self.best_sol)
-        return result_str
+        return "".join(
+            [str(improvement) + "\n" for improvement in self.improvements]
+            + [
+                str(len(self.improvements) - 1) + "\n",
+                str(self.improvements[-1]) + "\n",
+                str(self.best_sol),
+            ]
+        )
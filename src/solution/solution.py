@@ -1,13 +1,17 @@
-from typing import Dict, List, Optional, Set, Tuple, Type
+from array import array
+from functools import partial
+from typing import Dict, List, Optional, Tuple, Type
 
-from .. import portion as P
+from .. import timeline as T
 from ..elements.operating_room import OperatingRoom
 from ..elements.patient import Patient
 from ..elements.uce_room import UceRoom
 from ..heuristics import HeuristicBase
 from ..instance.instance import _UCE_ROOMS_, Instance
+from ..profiling import PROFILER
 from .assignment import Assignment
-from .criterion import Criterion, MaxTime, MinTime, MinWhiteSpaces
+from .criterion import CandidateBatch, Criterion, MaxTime, MinTime, MinWhiteSpaces
+from .decoding import Checkpoint, DecodingCheckpoints, DecodingPass
 
 WEIGHT_OBJECTIVE_1 = 100
 WEIGHT_OBJECTIVE_2 = 10
@@ -31,6 +35,15 @@ class SolutionParameters:
         self.sort_by_uce = sort_by_uce
         self.criterion_type = criterion_type
 
+    def _key(self) -> Tuple[bool, bool, bool, bool, Type[Criterion]]:
+        return self.assign_last, self.assign_beginning, self.sort_by_maximum, self.sort_by_uce, self.criterion_type
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, SolutionParameters) and self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
 
 SOLUTION_PARAMETERS_LIST = [
     SolutionParameters(
@@ -76,31 +89,54 @@ class Solution:
             if solution_parameters is not None
             else SolutionParameters(True, True, True, True, MinTime)
         )
+        # The state of the rooms is kept in lists indexed by their id
+        number_ors = max((operating_room.id for operating_room in instance.operating_rooms), default=0) + 1
+        number_urs = max((uce_room.id for uce_room in instance.uce_rooms), default=0) + 1
+        # Sex of the first patient assigned to each uce room (0 while the room is empty)
+        self.uce_room_sex: List[int] = [0] * number_urs
+        # Occupied hours of each operating room, and of each uce room stacked by sex up to its capacity
+        self._occupied_or: List[int] = [0] * number_ors
+        self._occupied_ur: List[Dict[int, List[int]]] = [{} for _ in range(number_urs)]
+        # Free slots, computed on demand and discarded when the room receives a new assignment
+        self._free_slots_or: List[Optional[List[T.Slot]]] = [None] * number_ors
+        self._free_slots_ur: List[Dict[int, List[T.Slot]]] = [{} for _ in range(number_urs)]
 
     def assign(self, assignment: Assignment) -> None:
         self.assignments.append(assignment)
         self.assignments_by_or[assignment.operating_room].append(assignment)
         self.assignments_by_ur[assignment.uce_room].append(assignment)
+        id_or, id_ur = assignment.operating_room.id, assignment.uce_room.id
+        if self.uce_room_sex[id_ur] == 0:
+            self.uce_room_sex[id_ur] = assignment.patient.sex
+
+        self._occupied_or[id_or] |= assignment.operation_cleaning_mask
+        self._free_slots_or[id_or] = None
+        levels = self._occupied_ur[id_ur].setdefault(assignment.patient.sex, [0] * assignment.uce_room.capacity)
+        T.stack(levels, assignment.uce_mask)
+        self._free_slots_ur[id_ur].clear()
+
+    def availability_or(self, operating_room: OperatingRoom) -> int:
+        return self.instance.operation_mask & ~self._occupied_or[operating_room.id]
 
-    def availability_or(self, operating_room: OperatingRoom) -> P.Interval:
-        availability = self.instance.operation_interval
-        for assignment in self.assignments_by_or[operating_room]:
-            availability = availability - assignment.operation_cleaning_interval
-        return availability
-
-    def availability_ur(self, uce_room: UceRoom, sex: int) -> P.Interval:
-        availability = self.instance.uce_interval
-        # Ranges with assignments of different sex are not available
-        for assignment in self.assignments_by_ur[uce_room]:
-            if assignment.patient.sex != sex:
-                availability = availability - assignment.uce_interval
-        # Ranges of intersections of same sex (it is assumed that the capacity of the rooms is 2)
-        for i, assignment1 in enumerate(self.assignments_by_ur[uce_room]):
-            if assignment1.patient.sex == sex:
-                for assignment2 in self.assignments_by_ur[uce_room][i + 1 :]:
-                    if assignment2.patient.sex == sex:
-                        availability = availability - (assignment1.uce_interval & assignment2.uce_interval)
-        return availability
+    def availability_ur(self, uce_room: UceRoom, sex: int) -> int:
+        occupied = 0
+        for sex_assigned, levels in self._occupied_ur[uce_room.id].items():
+            # Ranges with assignments of different sex are not available, neither are the full ones of the same sex
+            occupied |= levels[-1] if sex_assigned == sex else levels[0]
+        return self.instance.uce_mask & ~occupied
+
+    def free_slots_or(self, operating_room: OperatingRoom) -> List[T.Slot]:
+        slots = self._free_slots_or[operating_room.id]
+        if slots is None:
+            slots = self._free_slots_or[operating_room.id] = T.runs(self.availability_or(operating_room))
+        return slots
+
+    def free_slots_ur(self, uce_room: UceRoom, sex: int) -> List[T.Slot]:
+        slots_by_sex = self._free_slots_ur[uce_room.id]
+        slots = slots_by_sex.get(sex)
+        if slots is None:
+            slots = slots_by_sex[sex] = T.runs(self.availability_ur(uce_room, sex))
+        return slots
 
     def number_operated_patients(self) -> int:
         return len(self.assignments)
@@ -109,7 +145,7 @@ class Solution:
         return sum(assignment.patient.priority for assignment in self.assignments)
 
     def uce_number_hours(self) -> int:
-        return sum(assignment.uce_interval.upper - assignment.uce_interval.lower for assignment in self.assignments)
+        return sum(assignment.uce_end - assignment.uce_start for assignment in self.assignments)
 
     def value(self) -> float:
         return (
@@ -122,127 +158,209 @@ class Solution:
         sol_str = ""
         sol_str += _SEPARATOR_.join([str(assig.patient.id) for assig in self.assignments]) + "\n"
         sol_str += _SEPARATOR_.join([str(assig.operating_room.id) for assig in self.assignments]) + "\n"
-        sol_str += _SEPARATOR_.join([str(assig.operation_interval.lower) for assig in self.assignments]) + "\n"
+        sol_str += _SEPARATOR_.join([str(assig.operation_start) for assig in self.assignments]) + "\n"
         sol_str += _SEPARATOR_.join([str(assig.uce_room.id) for assig in self.assignments]) + "\n"
-        sol_str += _SEPARATOR_.join([str(assig.uce_interval.lower) for assig in self.assignments])
+        sol_str += _SEPARATOR_.join([str(assig.uce_start) for assig in self.assignments])
         return sol_str
 
-    def find_solution(self, heuristic: HeuristicBase) -> List[Patient]:
-        operable_patients = heuristic.sort(self.instance.operable_patients())
-        patients_assigned = self.assign_to_end(operable_patients)
-        patients_assigned = self.assign_to_beginning(operable_patients, patients_assigned)
-        self.default_assignment(operable_patients, patients_assigned)
+    def compact(self) -> array:
+        """Assignments as a flat array of (patient, operating room, operation start, uce room, uce start)"""
+        compact = array("H")
+        for assig in self.assignments:
+            compact.extend(
+                (assig.patient.id, assig.operating_room.id, assig.operation_start, assig.uce_room.id, assig.uce_start)
+            )
+        return compact
+
+    @classmethod
+    def from_compact(
+        cls, instance: Instance, compact: array, solution_parameters: Optional[SolutionParameters] = None
+    ) -> "Solution":
+        dict_patients = {patient.id: patient for patient in instance.patients}
+        dict_operating_rooms = {operating_room.id: operating_room for operating_room in instance.operating_rooms}
+        dict_uce_rooms = {uce_room.id: uce_room for uce_room in instance.uce_rooms}
+        solution = cls(instance, solution_parameters)
+        for idx in range(0, len(compact), 5):
+            patient_id, operating_room_id, operation_start, uce_room_id, uce_start = compact[idx : idx + 5]
+            solution.assign(
+                Assignment(
+                    patient=dict_patients[patient_id],
+                    operating_room=dict_operating_rooms[operating_room_id],
+                    operation_start=operation_start,
+                    uce_room=dict_uce_rooms[uce_room_id],
+                    uce_start=uce_start,
+                )
+            )
+        return solution
+
+    def find_solution(
+        self, heuristic: HeuristicBase, checkpoints: Optional[DecodingCheckpoints] = None
+    ) -> List[Patient]:
+        with PROFILER.stage("heuristic.sort"):
+            operable_patients = heuristic.sort(self.instance.operable_patients())
+        decoding_passes = self.decoding_passes()
+        order = tuple(patient.id for patient in operable_patients)
+
+        recorded: List[Checkpoint] = []
+        if checkpoints is not None:
+            recorded, assignments = checkpoints.find(self.solution_parameters, order)
+            for assignment in assignments:
+                self.assign(assignment)
+        if not recorded:
+            recorded = [Checkpoint(pass_index=0, position=0, phase_assignments=0, number_assignments=0, prefix=0)]
+        pass_index, position, phase_assignments, _, prefix = recorded[-1]
+        # Flags indexed by patient id
+        patients_assigned = bytearray(max((patient.id for patient in self.instance.patients), default=0) + 1)
+        for patient in self.get_patients_assigned():
+            patients_assigned[patient.id] = 1
+
+        while operable_patients and pass_index < len(decoding_passes):
+            decoding_pass = decoding_passes[pass_index]
+            patient = operable_patients[position]
+            if not patients_assigned[patient.id] and (
+                decoding_pass.uce_time == 0 or patient.surgical_type.uce_time == decoding_pass.uce_time
+            ):
+                with PROFILER.stage(decoding_pass.phase):
+                    assigned = self.assign_patient(patient, decoding_pass.criterion())
+                if assigned:
+                    phase_assignments += 1
+                    patients_assigned[patient.id] = 1
+            prefix = max(prefix, position + 1)
+            position += 1
+
+            if phase_assignments == decoding_pass.limit:
+                # The phase is over, skip its remaining passes
+                while pass_index < len(decoding_passes) and decoding_passes[pass_index].phase == decoding_pass.phase:
+                    pass_index += 1
+                position, phase_assignments = 0, 0
+            elif position == len(operable_patients):
+                pass_index += 1
+                position = 0
+                if pass_index < len(decoding_passes) and decoding_passes[pass_index].phase != decoding_pass.phase:
+                    phase_assignments = 0
+
+            checkpoint = Checkpoint(pass_index, position, phase_assignments, len(self.assignments), prefix)
+            if recorded[-1].prefix == prefix:
+                recorded[-1] = checkpoint
+            else:
+                recorded.append(checkpoint)
+
+        if checkpoints is not None:
+            checkpoints.store(self.solution_parameters, order, recorded, self.assignments)
         return operable_patients
 
-    def assign_to_beginning(self, patients_list: List[Patient], patients_assigned: Set[Patient]) -> Set[Patient]:
-        if not self.solution_parameters.assign_beginning:
-            return patients_assigned
-        num_assignments = 0
-        for patient in patients_list:
-            if patient in patients_assigned:
-                continue
-            if self.assign_patient(patient, MinTime(14)):
-                num_assignments += 1
-                patients_assigned.add(patient)
-                if num_assignments == _UCE_ROOMS_ * 2:
-                    return patients_assigned
-        return patients_assigned
-
-    def assign_to_end(self, patients_list: List[Patient]) -> Set[Patient]:
-        if not self.solution_parameters.assign_last:
-            return set()
-        num_assignments = 0
-        patients_assigned: Set[Patient] = set()
-        minimum_end_times = [156, 144] if self.solution_parameters.sort_by_maximum else [144]
-        sort_by_uce = [72, 60, 48, 36, 24] if self.solution_parameters.sort_by_uce else [0]
-        for uce_time in sort_by_uce:
-            for minimum_end_time in minimum_end_times:
-                for patient in patients_list:
-                    if patient in patients_assigned:
-                        continue
-                    if uce_time != 0 and patient.surgical_type.uce_time != uce_time:
-                        continue
-                    if self.assign_patient(patient, MaxTime(minimum_end_time)):
-                        num_assignments += 1
-                        patients_assigned.add(patient)
-                        if num_assignments == _UCE_ROOMS_ * 2:
-                            return patients_assigned
-        return patients_assigned
-
-    def default_assignment(self, patients_list: List[Patient], patients_assigned: Set[Patient]) -> Set[Patient]:
-        for patient in patients_list:
-            if patient in patients_assigned:
-                continue
-            self.assign_patient(patient, self.solution_parameters.criterion_type(0))
+    def decoding_passes(self) -> List[DecodingPass]:
+        passes: List[DecodingPass] = []
+        # Patients that stay in the uce until the end of the week, the ones with the longest stays first
+        if self.solution_parameters.assign_last:
+            minimum_end_times = [156, 144] if self.solution_parameters.sort_by_maximum else [144]
+            sort_by_uce = [72, 60, 48, 36, 24] if self.solution_parameters.sort_by_uce else [0]
+            for uce_time in sort_by_uce:
+                for minimum_end_time in minimum_end_times:
+                    passes.append(
+                        DecodingPass(
+                            phase="assign_to_end",
+                            criterion=partial(MaxTime, minimum_end_time),
+                            uce_time=uce_time,
+                            limit=_UCE_ROOMS_ * 2,
+                        )
+                    )
+        # Patients that enter the uce as soon as it opens
+        if self.solution_parameters.assign_beginning:
+            passes.append(
+                DecodingPass(phase="assign_to_beginning", criterion=partial(MinTime, 14), limit=_UCE_ROOMS_ * 2)
+            )
+        # The rest of the patients
+        passes.append(
+            DecodingPass(phase="default_assignment", criterion=partial(self.solution_parameters.criterion_type, 0))
+        )
+        return passes
 
     def assign_patient(self, patient: Patient, criterion: Criterion) -> bool:
-        available_ors = self.find_available_ors(patient)
-        available_uces = self.find_available_uces(patient)
+        with PROFILER.stage("find_available_ors"):
+            available_ors = self.find_available_ors(patient)
+        with PROFILER.stage("find_available_uces"):
+            available_uces = self.find_available_uces(patient)
+        with PROFILER.stage("criterion_scan"):
+            candidates = self._scan_candidates(patient, criterion, available_ors, available_uces)
+        PROFILER.count("candidates per assign_patient", candidates)
+
+        if criterion.best_assignment is not None:
+            self.assign(criterion.best_assignment)
+            return True
+        return False
+
+    def _scan_candidates(
+        self,
+        patient: Patient,
+        criterion: Criterion,
+        available_ors: List[Tuple[OperatingRoom, T.Slot]],
+        available_uces: List[Tuple[UceRoom, T.Slot]],
+    ) -> int:
+        """Evaluates the assignments of the patient to the free slots with `criterion`, returns how many there were"""
+        surgical_type = patient.surgical_type
+        candidates = 0
 
         sex_order = [1, 0, 2] if patient.sex == 1 else [2, 0, 1]
         for sex in sex_order:
             for or_, or_interval in available_ors:
-                min_start = or_interval.lower + patient.surgical_type.operation_time + patient.surgical_type.urpa_time
-                max_start = (
-                    or_interval.upper
-                    + patient.surgical_type.urpa_time
-                    + patient.surgical_type.urpa_max_waiting_time
-                    + 1
-                )
-                max_start_minimum = min_start + patient.surgical_type.urpa_max_waiting_time + 1
+                min_start = or_interval.lower + patient.time_to_uce()
+                max_start = or_interval.upper + surgical_type.urpa_time + surgical_type.urpa_max_waiting_time + 1
+                max_start_minimum = min_start + surgical_type.urpa_max_waiting_time + 1
+                late_operation_start = or_interval.upper - surgical_type.operation_time
 
                 for uce, uce_interval in available_uces:
-                    if uce.sex != sex:
+                    if self.uce_room_sex[uce.id] != sex:
                         continue
                     if uce_interval.lower > max_start:
                         continue
-                    for starting_time in range(max(min_start, uce_interval.lower), max_start):
-                        patient_uce_interval = P.closedopen(
-                            starting_time,
-                            starting_time + patient.surgical_type.uce_time,
-                        )
-                        if uce_interval.contains(patient_uce_interval):
-                            operation_start = (
-                                or_interval.lower
-                                if starting_time < max_start_minimum
-                                else or_interval.upper - patient.surgical_type.operation_time
+                    # Uce starts whose stay fits in the slot: the earliest ones follow an operation at the beginning
+                    # of the operating room slot and the latest ones an operation at its end
+                    first_start = max(min_start, uce_interval.lower)
+                    stop_start = min(max_start, uce_interval.upper - surgical_type.uce_time + 1)
+                    if first_start < min(stop_start, max_start_minimum):
+                        candidates += min(stop_start, max_start_minimum) - first_start
+                        criterion.evaluate_batch(
+                            CandidateBatch(
+                                patient=patient,
+                                operating_room=or_,
+                                operation_start=or_interval.lower,
+                                uce_room=uce,
+                                uce_slot=uce_interval,
+                                uce_starts=range(first_start, min(stop_start, max_start_minimum)),
                             )
-                            new_assignment = Assignment(
+                        )
+                    if max(first_start, max_start_minimum) < stop_start:
+                        candidates += stop_start - max(first_start, max_start_minimum)
+                        criterion.evaluate_batch(
+                            CandidateBatch(
                                 patient=patient,
                                 operating_room=or_,
-                                operation_start=operation_start,
+                                operation_start=late_operation_start,
                                 uce_room=uce,
-                                uce_start=starting_time,
+                                uce_slot=uce_interval,
+                                uce_starts=range(max(first_start, max_start_minimum), stop_start),
                             )
-                            criterion.evaluate(new_assignment, uce_interval)
+                        )
 
             if criterion.best_assignment is not None:
-                criterion.best_assignment.uce_room.sex = patient.sex
                 break
+        return candidates
 
-        if criterion.best_assignment is not None:
-            self.assign(criterion.best_assignment)
-            return True
-        return False
-
-    def find_available_ors(self, patient: Patient) -> List[Tuple[OperatingRoom, P.Interval]]:
-        available_ors: List[Tuple[OperatingRoom, P.Interval]] = []
+    def find_available_ors(self, patient: Patient) -> List[Tuple[OperatingRoom, T.Slot]]:
+        available_ors: List[Tuple[OperatingRoom, T.Slot]] = []
         for operating_room in self.instance.feasible_operating_rooms(patient):
-            availability_or = self.availability_or(operating_room)
-            for inter in availability_or:
-                operating_interval = P.closedopen(inter.lower, inter.lower + patient.surgical_type.operation_time)
-                if inter.contains(operating_interval):
-                    available_ors.append((operating_room, inter))
+            for slot in self.free_slots_or(operating_room):
+                if slot.upper - slot.lower >= patient.surgical_type.operation_time:
+                    available_ors.append((operating_room, slot))
         return available_ors
 
-    def find_available_uces(self, patient: Patient) -> List[Tuple[UceRoom, P.Interval]]:
-        available_uces: List[Tuple[UceRoom, P.Interval]] = []
+    def find_available_uces(self, patient: Patient) -> List[Tuple[UceRoom, T.Slot]]:
+        available_uces: List[Tuple[UceRoom, T.Slot]] = []
         for uce_room in self.instance.uce_rooms:
-            availability_uces = self.availability_ur(uce_room, patient.sex)
-            for inter in availability_uces:
-                uce_time_interval = P.closedopen(inter.lower, inter.lower + patient.surgical_type.uce_time)
-                if inter.contains(uce_time_interval):
-                    available_uces.append((uce_room, inter))
+            for slot in self.free_slots_ur(uce_room, patient.sex):
+                if slot.upper - slot.lower >= patient.surgical_type.uce_time:
+                    available_uces.append((uce_room, slot))
         return available_uces
 
     def get_patients_assigned(self) -> List[Patient]:
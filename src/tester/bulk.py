@@ -0,0 +1,129 @@
+"""
+Validation of every solution of a folder of exemplars, across a pool of processes. Each exemplar gets a JSON line
+with the result of every check, the breakdown of the objective and the time spent:
+
+    python -m src.tester.bulk --exemplars data/Exemplars/data --solutions data/Exemplars/solutions --report report.jsonl
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from ..instance.read_file import read_file as read_instance
+from ..solution.read_file import FormatException
+from ..solution.read_file import read_file as read_result
+from .occupancy import Occupancy
+from .tester import _test_functions_
+
+_SOLUTION_PREFIX_ = "sol_"
+
+
+def validate(path_instance: Path, path_result: Path) -> Dict[str, Any]:
+    report: Dict[str, Any] = {
+        "exemplar": str(path_instance),
+        "solution": str(path_result),
+        "correct": False,
+        "error": None,
+        "checks": {},
+        "objective": None,
+        "timings": {},
+    }
+    started = time.perf_counter()
+    try:
+        instance = read_instance(path=path_instance)
+        result = read_result(path=path_result, instance=instance)
+    except FileNotFoundError as e:
+        report["error"] = str(e)
+        return report
+    except FormatException:
+        report["error"] = "Formato del fichero de la solucion incorrect"
+        return report
+    except Exception as e:
+        # An empty or truncated solution fails in read_file before its format is checked
+        report["error"] = f"read: {type(e).__name__}: {e}"
+        return report
+    report["timings"]["read"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    try:
+        occupancy = Occupancy(result.best_sol)
+    except Exception as e:
+        report["error"] = f"Occupancy: {type(e).__name__}: {e}"
+        return report
+    report["timings"]["occupancy"] = time.perf_counter() - started
+
+    for test_function in _test_functions_:
+        started = time.perf_counter()
+        try:
+            test_is_correct, _ = test_function(result, occupancy)
+        except Exception as e:
+            # A malformed solution must not stop the validation of the rest
+            report["error"] = f"{test_function.__name__}: {type(e).__name__}: {e}"
+            test_is_correct = False
+        report["timings"][test_function.__name__] = time.perf_counter() - started
+        report["checks"][test_function.__name__] = test_is_correct
+    report["correct"] = all(report["checks"].values())
+
+    sol = result.best_sol
+    report["objective"] = {
+        "value_given": result.improvements[-1].of,
+        "value": sol.value(),
+        "operated_patients": sol.number_operated_patients(),
+        "weighted_operated_patients": sol.weighted_number_operated_patients(),
+        "uce_hours": sol.uce_number_hours(),
+        "cpu_time": result.improvements[-1].cpu_time,
+    }
+    return report
+
+
+def _validate(paths: Tuple[Path, Path]) -> Dict[str, Any]:
+    return validate(*paths)
+
+
+def validate_folder(
+    path_exemplars: Path,
+    path_solutions: Path,
+    processes: Optional[int] = None,
+    solution_prefix: str = _SOLUTION_PREFIX_,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Reports of the exemplars of the folder, in name order, with their solution named `solution_prefix` + name. Every
+    exemplar gets exactly one report, even if its solution is missing or unreadable.
+    """
+    exemplars = sorted(entry.name for entry in os.scandir(path_exemplars) if entry.name.endswith(".txt"))
+    paths = [
+        (Path(path_exemplars) / exemplar, Path(path_solutions) / (solution_prefix + exemplar)) for exemplar in exemplars
+    ]
+    with multiprocessing.Pool(processes) as pool:
+        yield from pool.imap(_validate, paths)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--exemplars", required=True, help="folder of the exemplars")
+    parser.add_argument("--solutions", required=True, help="folder of the solutions")
+    parser.add_argument("--prefix", default=_SOLUTION_PREFIX_, help="prefix of the solution of each exemplar")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--report", default=None, help="JSONL file for the reports, the standard output by default")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    output = open(args.report, "w") if args.report is not None else sys.stdout
+    correct = total = 0
+    try:
+        for report in validate_folder(args.exemplars, args.solutions, args.processes, args.prefix):
+            output.write(json.dumps(report) + "\n")
+            correct += report["correct"]
+            total += 1
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    print(f"Correct solutions: {correct}/{total}", file=sys.stderr)
+    if correct < total:
+        sys.exit(1)
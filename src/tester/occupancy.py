@@ -0,0 +1,57 @@
+from typing import Dict, List
+
+from .. import timeline as T
+from ..solution.solution import Solution
+
+
+class Occupancy:
+    """
+    Occupied hours of every room of a solution, built in a single pass over its assignments so that the checks of
+    the tester are a few mask operations per room instead of comparing every pair of assignments
+    """
+
+    def __init__(self, solution: Solution):
+        # Hours of each operating room with at least one and at least two operations
+        self.operations_or: Dict[int, List[int]] = {}
+        # Operating rooms where an operation overlaps the cleaning of a previous assignment of the room
+        self.operation_after_cleaning_or: Dict[int, bool] = {}
+        for room in solution.instance.operating_rooms:
+            levels = [0, 0]
+            cleanings = 0
+            overlaps = False
+            for assig in solution.assignments_by_or[room]:
+                T.stack(levels, assig.operation_mask)
+                overlaps = overlaps or bool(cleanings & assig.operation_mask)
+                cleanings |= assig.cleaning_mask
+            self.operations_or[room.id] = levels
+            self.operation_after_cleaning_or[room.id] = overlaps
+
+        # Hours of each uce room occupied by each sex, and with at least k + 1 patients for k up to its capacity
+        self.uce_by_sex: Dict[int, Dict[int, int]] = {}
+        self.uce_levels: Dict[int, List[int]] = {}
+        for room in solution.instance.uce_rooms:
+            by_sex: Dict[int, int] = {}
+            levels = [0] * (room.capacity + 1)
+            for assig in solution.assignments_by_ur[room]:
+                by_sex[assig.patient.sex] = by_sex.get(assig.patient.sex, 0) | assig.uce_mask
+                T.stack(levels, assig.uce_mask)
+            self.uce_by_sex[room.id] = by_sex
+            self.uce_levels[room.id] = levels
+
+    def overlapping_operations(self) -> bool:
+        return any(levels[1] for levels in self.operations_or.values())
+
+    def overlapping_cleanings(self) -> bool:
+        return any(self.operation_after_cleaning_or.values())
+
+    def exceeded_capacity(self, checked_hours: int) -> bool:
+        return any(levels[-1] & checked_hours for levels in self.uce_levels.values())
+
+    def mixed_sex(self) -> bool:
+        for by_sex in self.uce_by_sex.values():
+            occupied = 0
+            for mask in by_sex.values():
+                if occupied & mask:
+                    return True
+                occupied |= mask
+        return False
@@ -2,17 +2,20 @@ import json
 from pathlib import Path
 from typing import Callable, List, Tuple
 
+from .. import timeline as T
 from ..instance.read_file import read_file as read_instance
 from ..solution.read_file import FormatException
 from ..solution.read_file import read_file as read_result
 from ..solution.result import Result
+from .occupancy import Occupancy
 
 _MAX_SECONDS_ = 300
 
 TestResult = Tuple[bool, str]
-TestFunction = Callable[[Result], TestResult]
+# Checks of a result, given the occupancy of the rooms in its best solution
+TestFunction = Callable[[Result, Occupancy], TestResult]
 
-with open(Path.cwd() / "src" / "tester" / "messages.json", "r") as f:
+with open(Path(__file__).parent / "messages.json", "r") as f:
     messages = json.load(f)
 
 
@@ -20,58 +23,43 @@ def _format_check(correct: bool) -> str:
     return "OK" if correct else "INCORRECT"
 
 
-def patient_in_feasible_operating_room(result: Result) -> TestResult:
+def patient_in_feasible_operating_room(result: Result, occupancy: Occupancy) -> TestResult:
     sol = result.best_sol
     is_correct = all(assig.patient.surgical_type == assig.operating_room.surgical_type for assig in sol.assignments)
     msg = messages["patient_in_feasible_operating_room"].format(_format_check(is_correct))
     return is_correct, msg
 
 
-def no_overlap_patients_in_same_operating_room(result: Result) -> TestResult:
-    sol = result.best_sol
-    is_correct = all(
-        (assig1.operation_interval & assig2.operation_interval).empty
-        for room in sol.instance.operating_rooms
-        for idx, assig1 in enumerate(sol.assignments_by_or[room])
-        for assig2 in sol.assignments_by_or[room][idx + 1 :]
-    )
+def no_overlap_patients_in_same_operating_room(result: Result, occupancy: Occupancy) -> TestResult:
+    is_correct = not occupancy.overlapping_operations()
     msg = messages["no_overlap_patients_in_same_operating_room"].format(_format_check(is_correct))
     return is_correct, msg
 
 
-def no_overlap_operating_and_cleaning_in_same_operating_room(
-    result: Result,
-) -> TestResult:
-    sol = result.best_sol
-    is_correct = all(
-        (assig1.cleaning_interval & assig2.operation_interval).empty
-        for room in sol.instance.operating_rooms
-        for idx, assig1 in enumerate(sol.assignments_by_or[room])
-        for assig2 in sol.assignments_by_or[room][idx + 1 :]
-    )
+def no_overlap_operating_and_cleaning_in_same_operating_room(result: Result, occupancy: Occupancy) -> TestResult:
+    is_correct = not occupancy.overlapping_cleanings()
     msg = messages["no_overlap_operating_and_cleaning_in_same_operating_room"].format(_format_check(is_correct))
     return is_correct, msg
 
 
-def operations_in_allowed_shift(result: Result) -> TestResult:
+def operations_in_allowed_shift(result: Result, occupancy: Occupancy) -> TestResult:
     sol = result.best_sol
-    is_correct = all(assig.operation_interval in sol.instance.operation_interval for assig in sol.assignments)
+    is_correct = all(
+        T.covers(sol.instance.operation_mask, assig.operation_start, assig.operation_end) for assig in sol.assignments
+    )
     msg = messages["operations_in_allowed_shift"].format(_format_check(is_correct))
     return is_correct, msg
 
 
-def time_in_urpa_room(result: Result) -> TestResult:
+def time_in_urpa_room(result: Result, occupancy: Occupancy) -> TestResult:
     sol = result.best_sol
-    is_correct = all(
-        (assig.urpa_interval.upper - assig.urpa_interval.lower) - assig.waiting_time
-        == assig.patient.surgical_type.urpa_time
-        for assig in sol.assignments
-    )
+    # The patient enters the uce after the whole urpa time, possibly waiting for a free bed
+    is_correct = all(assig.waiting_time >= 0 for assig in sol.assignments)
     msg = messages["time_in_urpa_room"].format(_format_check(is_correct))
     return is_correct, msg
 
 
-def maximum_waiting_in_urpa_room(result: Result) -> TestResult:
+def maximum_waiting_in_urpa_room(result: Result, occupancy: Occupancy) -> TestResult:
     sol = result.best_sol
     is_correct = all(
         assig.waiting_time <= assig.patient.surgical_type.urpa_max_waiting_time for assig in sol.assignments
@@ -80,44 +68,28 @@ def maximum_waiting_in_urpa_room(result: Result) -> TestResult:
     return is_correct, msg
 
 
-def uce_in_allowed_shift(result: Result) -> TestResult:
+def uce_in_allowed_shift(result: Result, occupancy: Occupancy) -> TestResult:
     sol = result.best_sol
-    is_correct = all(assig.uce_interval in sol.instance.uce_interval for assig in sol.assignments)
+    is_correct = all(T.covers(sol.instance.uce_mask, assig.uce_start, assig.uce_end) for assig in sol.assignments)
     msg = messages["uce_in_allowed_shift"].format(_format_check(is_correct))
     return is_correct, msg
 
 
-def no_exceed_capacity_uce_room(result: Result) -> TestResult:
+def no_exceed_capacity_uce_room(result: Result, occupancy: Occupancy) -> TestResult:
     sol = result.best_sol
-    for room in sol.instance.uce_rooms:
-        for hour in range(sol.instance.uce_interval.lower, sol.instance.uce_interval.upper + 1):
-            total_assigned = sum(hour in assig.uce_interval for assig in sol.assignments_by_ur[room])
-            if total_assigned > room.capacity:
-                is_correct = False
-                break
-
-    is_correct = all(
-        sum(hour in assig.uce_interval for assig in sol.assignments_by_ur[room]) <= room.capacity
-        for room in sol.instance.uce_rooms
-        for hour in range(sol.instance.uce_interval.lower, sol.instance.uce_interval.upper + 1)
-    )
+    checked_hours = T.closedopen(sol.instance.uce_interval.lower, sol.instance.uce_interval.upper + 1)
+    is_correct = not occupancy.exceeded_capacity(checked_hours)
     msg = messages["no_exceed_capacity_uce_room"].format(_format_check(is_correct))
     return is_correct, msg
 
 
-def no_mixed_sex_in_uce_room(result: Result) -> TestResult:
-    sol = result.best_sol
-    is_correct = all(
-        assig1.patient.sex == assig2.patient.sex or (assig1.uce_interval & assig2.uce_interval).empty
-        for room in sol.instance.uce_rooms
-        for idx, assig1 in enumerate(sol.assignments_by_ur[room])
-        for assig2 in sol.assignments_by_ur[room][idx + 1 :]
-    )
+def no_mixed_sex_in_uce_room(result: Result, occupancy: Occupancy) -> TestResult:
+    is_correct = not occupancy.mixed_sex()
     msg = messages["no_mixed_sex_in_uce_room"].format(_format_check(is_correct))
     return is_correct, msg
 
 
-def value_sol(result: Result) -> TestResult:
+def value_sol(result: Result, occupancy: Occupancy) -> TestResult:
     sol = result.best_sol
     value_given = int(result.improvements[-1].of)
     is_correct = value_given == sol.value()
@@ -129,7 +101,7 @@ def value_sol(result: Result) -> TestResult:
     return is_correct, msg
 
 
-def maximum_cpu_time(result: Result) -> TestResult:
+def maximum_cpu_time(result: Result, occupancy: Occupancy) -> TestResult:
     is_correct = result.improvements[-1].cpu_time <= _MAX_SECONDS_
     msg = messages["maximum_cpu_time"].format(_format_check(is_correct))
     return is_correct, msg
@@ -161,9 +133,10 @@ def tester(path_instance: Path, path_result: Path) -> Tuple[bool, str]:
         all_correct = False
         msg = "Formato del fichero de la solucion incorrect"
     else:
+        occupancy = Occupancy(result.best_sol)
         all_correct, list_msg = True, []
         for test_function in _test_functions_:
-            test_is_correct, test_msg = test_function(result)
+            test_is_correct, test_msg = test_function(result, occupancy)
             all_correct = all_correct and test_is_correct
             list_msg.append(test_msg)
         msg = "\n".join(list_msg)
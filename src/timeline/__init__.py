@@ -0,0 +1 @@
+from .bitmask import HORIZON, Slot, closedopen, covered_at_least, covers, from_interval, runs, stack, to_interval
@@ -0,0 +1,74 @@
+"""
+Timelines as integer bitsets: hour ``h`` of the planning horizon is bit ``h`` of a Python int.
+
+Occupancy, free-slot search and containment become a few integer operations, and
+``portion`` intervals are only needed to read or write them.
+"""
+from collections import namedtuple
+from typing import Iterable, List
+
+from .. import portion as P
+
+HORIZON = 192
+
+Slot = namedtuple("Slot", ["lower", "upper"])
+
+
+def closedopen(lower: int, upper: int) -> int:
+    """Mask of the hours in [lower, upper). Hours before 0 are outside every shift and are dropped."""
+    lower = max(lower, 0)
+    if upper <= lower:
+        return 0
+    return ((1 << (upper - lower)) - 1) << lower
+
+
+def covers(mask: int, lower: int, upper: int) -> bool:
+    """Checks if every hour of [lower, upper) belongs to the mask"""
+    if upper <= lower:
+        return True
+    return lower >= 0 and not closedopen(lower, upper) & ~mask
+
+
+def runs(mask: int) -> List[Slot]:
+    """Maximal blocks of consecutive hours of the mask, in increasing order"""
+    slots: List[Slot] = []
+    while mask:
+        lower = (mask & -mask).bit_length() - 1
+        shifted = mask >> lower
+        length = (shifted ^ (shifted + 1)).bit_length() - 1
+        slots.append(Slot(lower, lower + length))
+        mask &= ~(((1 << length) - 1) << lower)
+    return slots
+
+
+def stack(levels: List[int], mask: int) -> None:
+    """Adds a mask to `levels`, where ``levels[k]`` holds the hours covered at least k + 1 times"""
+    for level in range(len(levels) - 1, 0, -1):
+        levels[level] |= levels[level - 1] & mask
+    levels[0] |= mask
+
+
+def covered_at_least(masks: Iterable[int], times: int) -> int:
+    """Mask of the hours that belong to at least `times` of the masks"""
+    levels = [0] * times
+    for mask in masks:
+        stack(levels, mask)
+    return levels[-1]
+
+
+def from_interval(interval: P.Interval) -> int:
+    mask = 0
+    for atomic in interval:
+        lower = max(atomic.lower, -1)
+        upper = min(atomic.upper, HORIZON)
+        lower = lower if atomic.left == P.CLOSED else lower + 1
+        upper = upper + 1 if atomic.right == P.CLOSED else upper
+        mask |= closedopen(lower, upper)
+    return mask
+
+
+def to_interval(mask: int) -> P.Interval:
+    interval = P.empty()
+    for slot in runs(mask):
+        interval = interval | P.closedopen(slot.lower, slot.upper)
+    return interval
@@ -0,0 +1,9 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def instance_cache(tmp_path, monkeypatch):
+    """Keeps the instance cache of the tests, and of the processes they start, in their temporary folder"""
+    cache = tmp_path / "instance_cache"
+    monkeypatch.setenv("HOSPITAL_ANOUK_CACHE", str(cache))
+    return cache
@@ -0,0 +1,40 @@
+import os
+
+from src.instance.binary_cache import read_data
+from src.instance.generator import generate_instance, write_instance
+from src.instance.read_file import parse_text
+
+
+def _parse(path):
+    with open(path, "r") as f:
+        return parse_text(f.read())
+
+
+def test_entry_is_written_and_read(tmp_path, instance_cache):
+    path = tmp_path / "exemplar.txt"
+    write_instance(path, generate_instance(20, seed=1))
+    assert read_data(path) == _parse(path)
+    assert len(os.listdir(instance_cache)) == 1
+    assert read_data(path) == _parse(path)
+
+
+def test_rewrite_with_same_size_and_modification_time_is_detected(tmp_path):
+    path = tmp_path / "exemplar.txt"
+    write_instance(path, generate_instance(20, seed=1))
+    read_data(path)
+    stat = os.stat(path)
+    # Same length, other values, and the modification time put back as `cp -p` or `touch -r` do
+    text = path.read_text()
+    path.write_text(text.replace("1", "2").replace("3", "1").replace("2", "3"))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert os.stat(path).st_size == stat.st_size
+    assert read_data(path) == _parse(path)
+
+
+def test_cache_can_be_turned_off(tmp_path, instance_cache, monkeypatch):
+    path = tmp_path / "exemplar.txt"
+    write_instance(path, generate_instance(20, seed=1))
+    assert read_data(path, use_cache=False) == _parse(path)
+    monkeypatch.setenv("HOSPITAL_ANOUK_CACHE", "off")
+    assert read_data(path) == _parse(path)
+    assert not instance_cache.exists()
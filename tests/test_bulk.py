@@ -0,0 +1,70 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from src.heuristics import HeuristicGenerator
+from src.instance import get_instance
+from src.instance.generator import generate_instance, write_instance
+from src.solution import Result, Solution
+from src.tester.bulk import validate_folder
+
+_ROOT_ = Path(__file__).resolve().parent.parent
+
+
+def _write_folders(tmp_path: Path) -> Path:
+    """Exemplars with a correct, an empty, a truncated and a missing solution"""
+    exemplars, solutions = tmp_path / "exemplars", tmp_path / "solutions"
+    exemplars.mkdir()
+    solutions.mkdir()
+    for name in ("correct", "empty", "truncated", "cut_solution", "missing"):
+        write_instance(exemplars / f"{name}.txt", generate_instance(30, seed=len(name)))
+
+    instance = get_instance(exemplars / "correct.txt")
+    solution = Solution(instance)
+    solution.find_solution(HeuristicGenerator().get_heuristics_without_random()[0])
+    result = Result(solutions / "sol_correct.txt")
+    result.add_improvement(solution.value(), 0)
+    result.add_best(solution)
+
+    lines = (solutions / "sol_correct.txt").read_text().splitlines(keepends=True)
+    (solutions / "sol_empty.txt").write_text("")
+    # Only the improvements, and the solution without its last lines
+    (solutions / "sol_truncated.txt").write_text(lines[0])
+    (solutions / "sol_cut_solution.txt").write_text("".join(lines[:4]))
+    return tmp_path
+
+
+def test_every_solution_gets_a_report(tmp_path):
+    folders = _write_folders(tmp_path)
+    reports = {
+        Path(report["exemplar"]).stem: report
+        for report in validate_folder(folders / "exemplars", folders / "solutions", processes=1)
+    }
+    assert sorted(reports) == ["correct", "cut_solution", "empty", "missing", "truncated"]
+    assert reports["correct"]["correct"] and reports["correct"]["error"] is None
+    for name in ("cut_solution", "empty", "missing", "truncated"):
+        assert not reports[name]["correct"]
+        assert reports[name]["error"]
+
+
+def test_command_line_fails_if_a_solution_is_wrong(tmp_path):
+    folders = _write_folders(tmp_path)
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "src.tester.bulk",
+            "--exemplars",
+            str(folders / "exemplars"),
+            "--solutions",
+            str(folders / "solutions"),
+            "--processes",
+            "1",
+        ],
+        cwd=_ROOT_,
+        capture_output=True,
+        text=True,
+    )
+    assert completed.returncode == 1
+    assert len(completed.stdout.splitlines()) == 5
+    assert "Correct solutions: 1/5" in completed.stderr
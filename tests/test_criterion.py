@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from src import timeline as T
+from src.instance.generator import generate_instance
+from src.instance.read_file import build_instance
+from src.solution.criterion import CandidateBatch, MaxTime, MinTime, MinWhiteSpaces
+
+_CRITERIA_ = {
+    "MinTime": lambda rng: MinTime(rng.choice([0, 14, 40])),
+    "MaxTime": lambda rng: MaxTime(rng.choice([0, 144, 156])),
+    "MinWhiteSpaces": lambda rng: MinWhiteSpaces(0),
+}
+
+
+def _random_batches(rng, instance):
+    """Batches of one patient, with their uce starts inside a free slot where the stay fits"""
+    patient = rng.choice(instance.patients)
+    uce_time = patient.surgical_type.uce_time
+    batches = []
+    for _ in range(rng.randint(1, 6)):
+        lower = rng.choice([12, rng.randint(12, 100)])
+        upper = rng.choice([156, rng.randint(lower, 156)])
+        if upper - lower < uce_time:
+            continue
+        first = rng.randint(lower, upper - uce_time)
+        stop = rng.randint(first, upper - uce_time + 1)
+        batches.append(
+            CandidateBatch(
+                patient=patient,
+                operating_room=rng.choice(instance.operating_rooms),
+                operation_start=rng.randint(0, 150),
+                uce_room=rng.choice(instance.uce_rooms),
+                uce_slot=T.Slot(lower, upper),
+                uce_starts=range(first, stop),
+            )
+        )
+    return batches
+
+
+@pytest.mark.parametrize("name", sorted(_CRITERIA_))
+def test_batches_match_candidates_one_by_one(name):
+    rng = random.Random(name)
+    instance = build_instance(generate_instance(20, number_operating_rooms=3, seed=1))
+    for _ in range(3000):
+        seed = rng.random()
+        by_batch = _CRITERIA_[name](random.Random(seed))
+        one_by_one = _CRITERIA_[name](random.Random(seed))
+        for batch in _random_batches(rng, instance):
+            by_batch.evaluate_batch(batch)
+            for uce_start in batch.uce_starts:
+                one_by_one.evaluate(batch.assignment(uce_start), batch.uce_slot)
+
+        if one_by_one.best_assignment is None:
+            assert by_batch.best_assignment is None
+            continue
+        expected, found = one_by_one.best_assignment, by_batch.best_assignment
+        assert found is not None
+        assert (found.operating_room, found.operation_start, found.uce_room, found.uce_start) == (
+            expected.operating_room,
+            expected.operation_start,
+            expected.uce_room,
+            expected.uce_start,
+        )
+        assert by_batch.criterion == one_by_one.criterion
@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+from src.heuristics import CROSSOVER_OPERATORS
+from src.heuristics.crossover import cycle_crossover, one_point_crossover
+
+
+def _random_parents(rng, size):
+    """Two orders of the same ids, which do not need to be consecutive"""
+    parent_1 = rng.sample(range(1, 3 * size + 1), size)
+    parent_2 = rng.sample(parent_1, size)
+    return parent_1, parent_2
+
+
+@pytest.mark.parametrize("name", sorted(CROSSOVER_OPERATORS))
+def test_children_are_permutations_of_their_parents(name):
+    crossover_operator = CROSSOVER_OPERATORS[name]
+    rng = random.Random(0)
+    for size in [0, 1, 2, 3] + [rng.randint(4, 120) for _ in range(300)]:
+        parent_1, parent_2 = _random_parents(rng, size)
+        child = crossover_operator(list(parent_1), list(parent_2), rng)
+        assert sorted(child) == sorted(parent_1)
+
+
+@pytest.mark.parametrize("name", sorted(CROSSOVER_OPERATORS))
+def test_children_do_not_change_their_parents(name):
+    parent_1, parent_2 = _random_parents(random.Random(1), 50)
+    copy_1, copy_2 = list(parent_1), list(parent_2)
+    CROSSOVER_OPERATORS[name](parent_1, parent_2, random.Random(2))
+    assert (parent_1, parent_2) == (copy_1, copy_2)
+
+
+@pytest.mark.parametrize("name", sorted(CROSSOVER_OPERATORS))
+def test_same_seed_gives_the_same_child(name):
+    parent_1, parent_2 = _random_parents(random.Random(3), 80)
+    children = [CROSSOVER_OPERATORS[name](parent_1, parent_2, random.Random(4)) for _ in range(2)]
+    assert children[0] == children[1]
+
+
+# Edge recombination may walk the cycle of neighbours of equal parents in the other direction
+@pytest.mark.parametrize("name", sorted(set(CROSSOVER_OPERATORS) - {"edge_recombination"}))
+def test_equal_parents_give_the_same_order(name):
+    parent, _ = _random_parents(random.Random(5), 40)
+    assert CROSSOVER_OPERATORS[name](parent, list(parent), random.Random(6)) == parent
+
+
+def test_one_point_keeps_a_prefix_of_the_first_parent():
+    rng = random.Random(7)
+    for _ in range(200):
+        parent_1, parent_2 = _random_parents(rng, rng.randint(1, 60))
+        child = one_point_crossover(parent_1, parent_2, rng)
+        prefix = next((idx for idx, (a, b) in enumerate(zip(child, parent_1)) if a != b), len(child))
+        assert child[prefix:] == [patient for patient in parent_2 if patient in child[prefix:]]
+
+
+def test_cycle_keeps_every_patient_in_the_position_of_a_parent():
+    rng = random.Random(8)
+    for _ in range(200):
+        parent_1, parent_2 = _random_parents(rng, rng.randint(1, 60))
+        child = cycle_crossover(parent_1, parent_2, rng)
+        assert all(patient in (a, b) for patient, a, b in zip(child, parent_1, parent_2))
@@ -0,0 +1,39 @@
+import hashlib
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from src.heuristics import HeuristicGenerator, PredefinedOrder
+from src.instance import get_instance
+from src.solution import SOLUTION_PARAMETERS_LIST, Solution
+
+_DATA_ = Path(__file__).resolve().parent / "data"
+# Value and digest of every decode, written by the solver before any of the speed-ups
+_EXPECTED_ = json.loads((_DATA_ / "decodes.json").read_text())
+_RANDOM_ORDERS_ = 5
+
+
+def _heuristics(instance):
+    for heuristic in HeuristicGenerator().get_heuristics_without_random():
+        yield heuristic.__name__, heuristic
+    for seed in range(_RANDOM_ORDERS_):
+        patients = sorted(instance.operable_patients(), key=lambda patient: patient.id)
+        random.Random(seed).shuffle(patients)
+        yield f"random_{seed}", PredefinedOrder(patients)
+
+
+@pytest.mark.parametrize("name", sorted({key.split("/")[0] for key in _EXPECTED_}))
+def test_decodes_match_the_baseline(name):
+    instance = get_instance(_DATA_ / name)
+    decodes = {}
+    for parameters_index, parameters in enumerate(SOLUTION_PARAMETERS_LIST):
+        for heuristic_name, heuristic in _heuristics(instance):
+            solution = Solution(instance, parameters)
+            solution.find_solution(heuristic)
+            digest = hashlib.blake2b(str(solution).encode(), digest_size=16).hexdigest()
+            decodes[f"{name}/{heuristic_name}/{parameters_index}"] = [solution.value(), digest]
+
+    expected = {key: value for key, value in _EXPECTED_.items() if key.startswith(f"{name}/")}
+    assert decodes == expected
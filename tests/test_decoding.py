@@ -0,0 +1,52 @@
+import random
+
+import pytest
+
+from src.heuristics import EvolutionaryAlgorithm, PredefinedOrder
+from src.instance.generator import generate_instance
+from src.instance.read_file import build_instance
+from src.solution import SOLUTION_PARAMETERS_LIST, DecodingCheckpoints, Solution
+
+
+class _CountingCheckpoints(DecodingCheckpoints):
+    """Counts the decodes that resume from a checkpoint"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.resumed = 0
+
+    def find(self, key, order):
+        recorded, assignments = super().find(key, order)
+        self.resumed += bool(recorded)
+        return recorded, assignments
+
+
+@pytest.mark.parametrize("parameters_index", range(len(SOLUTION_PARAMETERS_LIST)))
+def test_resumed_decodes_equal_the_decodes_from_scratch(parameters_index):
+    parameters = SOLUTION_PARAMETERS_LIST[parameters_index]
+    instance = build_instance(generate_instance(60, number_operating_rooms=4, seed=parameters_index))
+    patients_by_id = {patient.id: patient for patient in instance.patients}
+    rng = random.Random(parameters_index)
+    checkpoints = _CountingCheckpoints()
+
+    population = []
+    for _ in range(8):
+        order = instance.operable_patients()
+        rng.shuffle(order)
+        solution = Solution(instance, parameters)
+        solution.find_solution(PredefinedOrder(order), checkpoints)
+        population.append(([patient.id for patient in order], solution.value()))
+
+    # Children of a population share long prefixes, so most of them resume from a checkpoint
+    for _ in range(3):
+        evolutionary_algorithm = EvolutionaryAlgorithm(population, rng=rng)
+        population = [evolutionary_algorithm.get_best_exemplar()]
+        for child in evolutionary_algorithm.get_population():
+            order = [patients_by_id[patient_id] for patient_id in child]
+            resumed, scratch = Solution(instance, parameters), Solution(instance, parameters)
+            resumed.find_solution(PredefinedOrder(order), checkpoints)
+            scratch.find_solution(PredefinedOrder(order))
+            assert str(resumed) == str(scratch)
+            assert resumed.value() == scratch.value()
+            population.append((child, resumed.value()))
+    assert checkpoints.resumed > 0
@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+from src import portion as P
+
+_VALUES_ = [-P.inf, 0, 1, 2, 3, 4, 5, P.inf]
+
+
+class IntInterval(P.AbstractDiscreteInterval):
+    _step = 1
+
+
+_DISCRETE_ = P.create_api(IntInterval)
+
+
+def _random_interval(rng, api=P):
+    interval = api.empty()
+    for _ in range(rng.randint(0, 3)):
+        lower, upper = sorted(rng.sample(_VALUES_, 2))
+        left = rng.choice([P.CLOSED, P.OPEN]) if lower != -P.inf else P.OPEN
+        right = rng.choice([P.CLOSED, P.OPEN]) if upper != P.inf else P.OPEN
+        interval |= api.Interval.from_atomic(left, lower, upper, right)
+        if rng.random() < 0.3:
+            interval |= api.singleton(rng.choice(_VALUES_[1:-1]))
+    return interval
+
+
+@pytest.mark.parametrize("api", [P, _DISCRETE_], ids=["continuous", "discrete"])
+def test_difference_matches_intersection_with_complement(api):
+    rng = random.Random(0)
+    for _ in range(5000):
+        a, b = _random_interval(rng, api), _random_interval(rng, api)
+        assert a - b == a & ~b, (a, b)
+
+
+def test_difference_of_floats_matches_intersection_with_complement():
+    rng = random.Random(1)
+
+    def random_floats():
+        interval = P.empty()
+        for _ in range(rng.randint(0, 3)):
+            lower, upper = sorted(rng.uniform(0, 10) for _ in range(2))
+            interval |= P.closedopen(lower, upper)
+        return interval
+
+    for _ in range(2000):
+        a, b = random_floats(), random_floats()
+        assert a - b == a & ~b, (a, b)
+
+
+def test_subtraction_in_place_keeps_other_references():
+    shift = P.closedopen(0, 10)
+    availability = shift
+    availability -= P.closedopen(2, 4)
+    assert availability == P.closedopen(0, 2) | P.closedopen(4, 10)
+    assert shift == P.closedopen(0, 10)
@@ -0,0 +1,80 @@
+import random
+
+from src import portion as P
+
+_RANGE_ = 30
+
+
+def _random_set(rng):
+    """An IntIntervalSet of integers in [0, 30), some of them a single IntInterval, with their Python set"""
+    bounds = []
+    for _ in range(rng.randint(1, 4) if rng.random() < 0.8 else 1):
+        lower = rng.randint(0, _RANGE_)
+        bounds.append((lower, rng.randint(lower - 2, _RANGE_)))
+    integers = {integer for lower, upper in bounds for integer in range(lower, upper)}
+    if len(bounds) == 1:
+        return P.IntInterval(*bounds[0]), integers
+    return P.IntIntervalSet(*(P.IntInterval(lower, upper) for lower, upper in bounds)), integers
+
+
+def _integers(interval_set):
+    return {integer for interval in interval_set for integer in range(interval.lower, interval.upper)}
+
+
+def _runs(integers):
+    """Number of maximal runs of consecutive integers"""
+    return sum(1 for integer in integers if integer - 1 not in integers)
+
+
+def _check(interval_set, integers):
+    assert _integers(interval_set) == integers
+    assert len(interval_set) == _runs(integers)
+    assert interval_set.empty == (not integers)
+    assert interval_set.atomic == (len(interval_set) <= 1)
+    assert interval_set.lower == (min(integers) if integers else P.inf)
+    assert interval_set.upper == (max(integers) + 1 if integers else -P.inf)
+    # The intervals are sorted, disjoint and not adjacent
+    intervals = list(interval_set)
+    assert all(a.upper < b.lower for a, b in zip(intervals, intervals[1:]))
+    assert [interval_set[idx] for idx in range(-len(intervals), 0)] == intervals
+    for integer in range(-2, _RANGE_ + 2):
+        assert (integer in interval_set) == (integer in integers)
+
+
+def test_operations_match_python_sets():
+    rng = random.Random(0)
+    for _ in range(3000):
+        (a, integers_a), (b, integers_b) = _random_set(rng), _random_set(rng)
+        _check(a, integers_a)
+        _check(a & b, integers_a & integers_b)
+        _check(a | b, integers_a | integers_b)
+        _check(a - b, integers_a - integers_b)
+        assert (b in a) == (integers_b <= integers_a)
+        assert a.overlaps(b) == bool(integers_a & integers_b)
+        assert (a == b) == (integers_a == integers_b)
+        if a == b:
+            assert hash(a) == hash(b)
+
+
+def test_operations_do_not_change_their_operands():
+    rng = random.Random(1)
+    for _ in range(500):
+        (a, integers_a), (b, integers_b) = _random_set(rng), _random_set(rng)
+        a & b, a | b, a - b
+        _check(a, integers_a)
+        _check(b, integers_b)
+
+
+def test_round_trip_through_portion_intervals():
+    rng = random.Random(2)
+    for _ in range(1000):
+        interval_set, integers = _random_set(rng)
+        interval = interval_set.to_interval()
+        assert all((integer in interval) == (integer in integers) for integer in range(-2, _RANGE_ + 2))
+        assert P.IntIntervalSet.from_interval(interval) == interval_set
+
+
+def test_from_interval_takes_the_integers_of_closed_and_open_bounds():
+    interval = P.open(0, 3) | P.closed(5, 7) | P.openclosed(10, 12) | P.closedopen(20, 21) | P.singleton(25)
+    integers = {1, 2, 5, 6, 7, 11, 12, 20, 25}
+    _check(P.IntIntervalSet.from_interval(interval), integers)
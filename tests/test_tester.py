@@ -0,0 +1,44 @@
+from src.heuristics import HeuristicGenerator
+from src.instance.generator import generate_instance, write_instance
+from src.instance.read_file import read_file as read_instance
+from src.solution import Result, Solution
+from src.solution.assignment import Assignment
+from src.tester.tester import tester as run_tester
+
+
+def _solve(tmp_path, uce_delay=None):
+    """Solution of a synthetic exemplar, with the uce stay of its first patient moved by `uce_delay` if given"""
+    path_instance, path_result = tmp_path / "exemplar.txt", tmp_path / "sol_exemplar.txt"
+    write_instance(path_instance, generate_instance(40, seed=1))
+    instance = read_instance(path_instance)
+    solution = Solution(instance)
+    solution.find_solution(HeuristicGenerator().get_heuristics_without_random()[0])
+    if uce_delay is not None:
+        assignments = solution.assignments
+        first = assignments[0]
+        assignments[0] = Assignment(
+            patient=first.patient,
+            operating_room=first.operating_room,
+            operation_start=first.operation_start,
+            uce_room=first.uce_room,
+            uce_start=first.operation_end + uce_delay,
+        )
+        solution = Solution(instance)
+        for assignment in assignments:
+            solution.assign(assignment)
+    result = Result(path_result)
+    result.add_improvement(solution.value(), 0)
+    result.add_best(solution)
+    return run_tester(path_instance, path_result)
+
+
+def test_solution_of_the_solver_is_correct(tmp_path):
+    is_correct, message = _solve(tmp_path)
+    assert is_correct, message
+
+
+def test_uce_start_before_the_end_of_the_urpa_time_is_incorrect(tmp_path):
+    # The patient goes to the uce right after the operation, skipping the urpa
+    is_correct, message = _solve(tmp_path, uce_delay=0)
+    assert not is_correct
+    assert message.splitlines()[4].endswith("INCORRECT")